@@ -52,10 +52,10 @@ def _map_api_to_algo(params: ApiSpreadParameters) -> AlgoSpreadParameters:  # ty
 def _map_algo_to_api(result: AlgoSpreadResult, duration_hours: float) -> ApiSpreadResult:  # type: ignore
     # Convert perimeter points
     perimeter_points: List[ApiPoint] = [
-        ApiPoint(latitude=lat, longitude=lon, altitude=0.0) for (lat, lon) in result.perimeter
+        ApiPoint(latitude=lat, longitude=lon, altitude=0.0) for (lat, lon) in result.perimeter.tolist()
     ]
 
-    # Convert isochrones (engine returns tuples list in geometry)
+    # Convert isochrones (engine returns an (N, 2) lat/lon array in geometry)
     api_isochrones: List[ApiIsochrone] = []
     for iso in result.isochrones:
         geom = [ApiPoint(latitude=lat, longitude=lon, altitude=0.0) for (lat, lon) in iso.get("geometry", [])]
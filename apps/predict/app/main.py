@@ -108,7 +108,7 @@ async def predict(body: PredictRequest):
         raise HTTPException(status_code=500, detail=f"Simulation failed: {e}")
 
     # Map perimeter
-    perimeter = [PerimeterPoint(lat=lat, lon=lon) for lat, lon in result.perimeter[:500]]  # cap for response size
+    perimeter = [PerimeterPoint(lat=lat, lon=lon) for lat, lon in result.perimeter[:500].tolist()]  # cap for response size
 
     # Map isochrones
     isochrones = [
@@ -6,6 +6,7 @@ import os
 import sys
 import json
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -35,12 +36,21 @@ AUDIT_DIR = Path(os.getcwd()) / "logs"
 AUDIT_FILE = AUDIT_DIR / "triangulate.audit.jsonl"
 AUDIT_DIR.mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="Sentinel Triangulation Service", version="1.0.0")
-app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
-
 engine = TriangulationEngine()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        yield
+    finally:
+        engine.close()
+
+
+app = FastAPI(title="Sentinel Triangulation Service", version="1.0.0", lifespan=lifespan)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+
+
 def _audit(input_data: dict, output_data: dict) -> None:
     """Append audit record to JSONL log."""
     try:
@@ -0,0 +1,22 @@
+"""
+Optional Numba support for the algorithm kernels.
+
+Kernels are declared with explicit signatures and ``cache=True`` so they are
+compiled eagerly at import time and reloaded from the on-disk cache by
+short-lived workers. When Numba is not installed, ``njit`` is a no-op and
+callers fall back to their NumPy implementations.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit``."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
@@ -8,10 +8,12 @@ from dataclasses import dataclass
 from sklearn.linear_model import LogisticRegression
 from sklearn.isotonic import IsotonicRegression
 from sklearn.preprocessing import StandardScaler
+import itertools
 import math
+import operator
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EnvironmentalData:
     """Environmental conditions for a grid cell."""
     latitude: float
@@ -32,7 +34,7 @@ class EnvironmentalData:
     historical_ignitions: int = 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskScore:
     """Risk score for a grid cell."""
     latitude: float
@@ -43,6 +45,89 @@ class RiskScore:
     timestamp: str
 
 
+# Numeric EnvironmentalData fields read by the batch paths
+_NUMERIC_FIELDS = (
+    "fuel_model", "slope_deg", "aspect_deg", "canopy_cover", "soil_moisture",
+    "fuel_moisture", "temperature_c", "relative_humidity", "wind_speed_mps",
+    "wind_direction_deg", "elevation_m", "lightning_strikes_24h", "historical_ignitions"
+)
+_get_numeric_fields = operator.attrgetter(*_NUMERIC_FIELDS)
+
+
+def _environment_columns(env_data_list: List[EnvironmentalData]) -> Dict[str, np.ndarray]:
+    """
+    Float64 column per numeric field of a batch of records.
+    
+    Each record's fields are fetched by one ``attrgetter`` call, so the batch
+    is walked once rather than once per field.
+    """
+    values = np.fromiter(
+        itertools.chain.from_iterable(map(_get_numeric_fields, env_data_list)),
+        dtype=np.float64, count=len(env_data_list) * len(_NUMERIC_FIELDS)
+    )
+    columns = np.ascontiguousarray(values.reshape(-1, len(_NUMERIC_FIELDS)).T)
+    return dict(zip(_NUMERIC_FIELDS, columns))
+
+
+def _derived_index_kernel(temp, rh, wind, slope):
+    """
+    Unclipped FWI, ERC and BI in one pass.
+    
+    Shares the dryness and wind subexpressions between the three indices and
+    works on scalars or NumPy arrays alike.
+    """
+    dry = (100 - rh) / 100.0
+    w20 = wind / 20.0
+    
+    # Fine fuel moisture code (simplified), boosted above 20 C
+    ffmc = 101 - rh + (temp - 20) * 2 * (temp > 20)
+    fwi = ffmc * (1 + w20) / 100.0
+    erc = (temp - 10) / 30.0 * dry * (1 + wind / 15.0)
+    bi = (temp / 40.0) * dry * (1 + w20 + slope / 45.0)
+    return fwi, erc, bi
+
+
+def _confidence_kernel(fuel_model, soil_moisture, fuel_moisture, wind, temp, rh):
+    """
+    Data-quality confidence on scalars or NumPy arrays alike.
+    
+    Each condition contributes its penalty factor raised to a boolean, so a
+    missing or implausible input multiplies in the factor and anything else 1.
+    """
+    return (
+        # Reduce confidence for missing data
+        0.8 ** (fuel_model == 0)
+        * 0.9 ** (soil_moisture == 0)
+        * 0.9 ** (fuel_moisture == 0)
+        * 0.8 ** (wind == 0)
+        # Reduce confidence for extreme values (may indicate data quality issues)
+        * 0.7 ** ((temp < -20) | (temp > 60))
+        * 0.7 ** ((rh < 5) | (rh > 100))
+    )
+
+
+# Heuristic fuel risk per Anderson 13 fuel model; unknown models score 0.5
+_FUEL_RISK = {
+    1: 0.1,   # Short grass
+    2: 0.2,   # Timber with grass
+    3: 0.3,   # Tall grass
+    4: 0.4,   # Chaparral
+    5: 0.5,   # Brush
+    6: 0.6,   # Dormant brush
+    7: 0.7,   # Southern rough
+    8: 0.8,   # Closed timber litter
+    9: 0.9,   # Hardwood litter
+    10: 0.8,  # Timber with litter
+    11: 0.6,  # Light logging slash
+    12: 0.7,  # Medium logging slash
+    13: 0.8   # Heavy logging slash
+}
+_DEFAULT_FUEL_RISK = 0.5
+
+# Same lookup as a table indexed by fuel model, slot 0 holding the default
+_FUEL_RISK_TABLE = np.array([_DEFAULT_FUEL_RISK] + [_FUEL_RISK[i] for i in range(1, 14)])
+
+
 class SensorFusionEngine:
     """Engine for sensor fusion and risk scoring."""
     
@@ -52,6 +137,19 @@ class SensorFusionEngine:
         self.isotonic_regressor = IsotonicRegression(out_of_bounds='clip')
         self.feature_importance = {}
         self.is_trained = False
+        
+        # Frozen float32 affine transform used for inference (binary models only)
+        self._frozen = False
+        self._mu32 = None
+        self._inv_scale32 = None
+        self._w32 = None
+        self._b32 = None
+        
+        # Feature names and the significant coefficients used for explanations
+        self._feature_names = tuple(self._get_feature_names())
+        self._significant_idx = np.empty(0, dtype=np.intp)
+        self._significant_names = []
+        self._significant_coefs = np.empty(0)
     
     def train_risk_model(self, training_data: List[Tuple[EnvironmentalData, float]]):
         """
@@ -64,16 +162,23 @@ class SensorFusionEngine:
             raise ValueError("Need at least 10 training samples")
         
         # Extract features and labels
-        X = []
-        y = []
+        X = self._extract_features_batch([env_data for env_data, _ in training_data])
+        y = np.array([risk_score for _, risk_score in training_data])
         
-        for env_data, risk_score in training_data:
-            features = self._extract_features(env_data)
-            X.append(features)
-            y.append(risk_score)
+        self.train_risk_model_arrays(X, y)
+    
+    def train_risk_model_arrays(self, X: np.ndarray, y: np.ndarray):
+        """
+        Train the risk scoring model on a prepared feature matrix.
         
-        X = np.array(X)
-        y = np.array(y)
+        Args:
+            X: (N, F) features laid out as ``_extract_features_batch`` returns them
+            y: Risk score label per row of ``X``
+        """
+        if len(X) < 10:
+            raise ValueError("Need at least 10 training samples")
+        if X.shape[1] != len(self._feature_names):
+            raise ValueError(f"Expected {len(self._feature_names)} feature columns, got {X.shape[1]}")
         
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
@@ -92,10 +197,11 @@ class SensorFusionEngine:
         
         # Store feature importance
         self.feature_importance = dict(zip(
-            self._get_feature_names(),
+            self._feature_names,
             self.risk_model.coef_[0]
         ))
         
+        self._freeze_model()
         self.is_trained = True
     
     def calculate_risk_score(self, env_data: EnvironmentalData) -> RiskScore:
@@ -114,10 +220,9 @@ class SensorFusionEngine:
         
         # Extract features
         features = self._extract_features(env_data)
-        features_scaled = self.scaler.transform([features])
         
         # Predict risk score
-        risk_prob = self.risk_model.predict_proba(features_scaled)[0, 1]
+        risk_prob = self._predict_proba(np.asarray([features]))[0]
         risk_score = self.isotonic_regressor.transform([risk_prob])[0]
         
         # Calculate confidence based on feature quality
@@ -135,6 +240,76 @@ class SensorFusionEngine:
             timestamp=env_data.timestamp
         )
     
+    def calculate_risk_scores_batch(self, env_data_list: List[EnvironmentalData]) -> List[RiskScore]:
+        """
+        Calculate risk scores for many records at once.
+        
+        Matches calling ``calculate_risk_score`` on each record (up to float32
+        rounding in the trained model), but extracts features column-wise and
+        scores the whole batch with array operations.
+        
+        Args:
+            env_data_list: Environmental conditions, one per grid cell
+            
+        Returns:
+            Risk scores in the same order as ``env_data_list``
+        """
+        if not env_data_list:
+            return []
+        if not self.is_trained:
+            return self._heuristic_risk_scores_batch(env_data_list)
+        
+        # Extract features and predict risk scores
+        columns = _environment_columns(env_data_list)
+        X = self._features_from_columns(columns)
+        risk_scores = self.isotonic_regressor.transform(self._predict_proba(X))
+        
+        # Calculate confidence from the raw (unnormalized) inputs
+        confidence = _confidence_kernel(
+            columns["fuel_model"], columns["soil_moisture"], columns["fuel_moisture"],
+            columns["wind_speed_mps"], columns["temperature_c"], columns["relative_humidity"]
+        )
+        
+        # Calculate contributing factors
+        contributions = X[:, self._significant_idx] * self._significant_coefs
+        
+        return [
+            RiskScore(
+                latitude=env_data.latitude,
+                longitude=env_data.longitude,
+                risk_score=score,
+                confidence=conf,
+                contributing_factors=dict(zip(self._significant_names, factors)),
+                timestamp=env_data.timestamp
+            )
+            for env_data, score, conf, factors in zip(
+                env_data_list, risk_scores.tolist(), confidence.tolist(), contributions.tolist()
+            )
+        ]
+    
+    def _freeze_model(self):
+        """Freeze the fitted scaler and logistic model into float32 arrays."""
+        # The closed-form sigmoid only holds for a binary model; multiclass keeps sklearn's softmax
+        self._frozen = len(self.risk_model.classes_) == 2
+        self._mu32 = self.scaler.mean_.astype(np.float32)
+        self._inv_scale32 = (1.0 / self.scaler.scale_).astype(np.float32)
+        self._w32 = self.risk_model.coef_[0].astype(np.float32)
+        self._b32 = np.float32(self.risk_model.intercept_[0])
+        
+        coefs = self.risk_model.coef_[0]
+        self._significant_idx = np.flatnonzero(np.abs(coefs) > 0.1)  # Only significant factors
+        self._significant_names = [self._feature_names[i] for i in self._significant_idx]
+        self._significant_coefs = coefs[self._significant_idx]
+    
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probability from the frozen model, skipping sklearn validation."""
+        if not self._frozen:
+            return self.risk_model.predict_proba(self.scaler.transform(X))[:, 1]
+        X32 = X.astype(np.float32, copy=False)
+        z = (X32 - self._mu32) * self._inv_scale32
+        logits = z @ self._w32 + self._b32
+        return 1.0 / (1.0 + np.exp(-logits))
+    
     def _extract_features(self, env_data: EnvironmentalData) -> List[float]:
         """Extract features from environmental data."""
         features = []
@@ -168,12 +343,61 @@ class SensorFusionEngine:
         features.append(min(env_data.historical_ignitions / 5.0, 1.0))  # Normalize ignitions
         
         # Derived features
-        features.append(self._calculate_fire_weather_index(env_data))
-        features.append(self._calculate_energy_release_component(env_data))
-        features.append(self._calculate_burning_index(env_data))
+        features.extend(self._derived_indices(env_data))
         
         return features
     
+    def _extract_features_batch(self, env_data_list: List[EnvironmentalData]) -> np.ndarray:
+        """Extract an (N, F) feature matrix, column by column, from a batch of records."""
+        return self._features_from_columns(_environment_columns(env_data_list))
+    
+    def _features_from_columns(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """(N, F) feature matrix from ``_environment_columns`` output."""
+        n = len(columns["fuel_model"])
+        column = columns.__getitem__
+        
+        slope = column("slope_deg")
+        temp = column("temperature_c")
+        rh = column("relative_humidity")
+        wind = column("wind_speed_mps")
+        aspect_rad = np.deg2rad(column("aspect_deg"))
+        wind_dir_rad = np.deg2rad(column("wind_direction_deg"))
+        
+        # Fuel model (one-hot encoded)
+        fuel_model = column("fuel_model").astype(np.int64)
+        fuel_model_features = np.zeros((n, 13))
+        known = (fuel_model >= 1) & (fuel_model <= 13)
+        fuel_model_features[np.flatnonzero(known), fuel_model[known] - 1] = 1.0
+        
+        # Derived features
+        fwi, erc, bi = _derived_index_kernel(temp, rh, wind, slope)
+        
+        return np.column_stack([
+            fuel_model_features,
+            # Terrain features
+            slope / 90.0,
+            np.sin(aspect_rad),
+            np.cos(aspect_rad),
+            column("canopy_cover"),
+            column("elevation_m") / 4000.0,
+            # Moisture features
+            column("soil_moisture"),
+            column("fuel_moisture"),
+            # Weather features
+            temp / 50.0,
+            rh / 100.0,
+            wind / 30.0,
+            np.sin(wind_dir_rad),
+            np.cos(wind_dir_rad),
+            # Fire history
+            np.minimum(column("lightning_strikes_24h") / 10.0, 1.0),
+            np.minimum(column("historical_ignitions") / 5.0, 1.0),
+            # Derived features
+            np.clip(fwi, 0.0, 1.0),
+            np.clip(erc, 0.0, 1.0),
+            np.clip(bi, 0.0, 1.0)
+        ])
+    
     def _get_feature_names(self) -> List[str]:
         """Get feature names for interpretation."""
         names = []
@@ -223,112 +447,51 @@ class SensorFusionEngine:
     
     def _calculate_fire_weather_index(self, env_data: EnvironmentalData) -> float:
         """Calculate Fire Weather Index (FWI)."""
-        # Simplified FWI calculation
-        temp = env_data.temperature_c
-        rh = env_data.relative_humidity
-        wind = env_data.wind_speed_mps
-        
-        # Fine fuel moisture code (simplified)
-        ffmc = 101 - rh
-        if temp > 20:
-            ffmc += (temp - 20) * 2
-        
-        # Wind effect
-        wind_factor = 1 + (wind / 20.0)
-        
-        fwi = ffmc * wind_factor / 100.0
-        return min(1.0, max(0.0, fwi))
+        fwi, _, _ = self._derived_indices(env_data)
+        return fwi
     
     def _calculate_energy_release_component(self, env_data: EnvironmentalData) -> float:
         """Calculate Energy Release Component (ERC)."""
-        # Simplified ERC calculation
-        temp = env_data.temperature_c
-        rh = env_data.relative_humidity
-        wind = env_data.wind_speed_mps
-        
-        # Base ERC from temperature and humidity
-        base_erc = (temp - 10) / 30.0 * (100 - rh) / 100.0
-        
-        # Wind adjustment
-        wind_factor = 1 + (wind / 15.0)
-        
-        erc = base_erc * wind_factor
-        return min(1.0, max(0.0, erc))
+        _, erc, _ = self._derived_indices(env_data)
+        return erc
     
     def _calculate_burning_index(self, env_data: EnvironmentalData) -> float:
         """Calculate Burning Index (BI)."""
-        # Simplified BI calculation
-        temp = env_data.temperature_c
-        rh = env_data.relative_humidity
-        wind = env_data.wind_speed_mps
-        slope = env_data.slope_deg
-        
-        # Base burning index
-        base_bi = (temp / 40.0) * (100 - rh) / 100.0
-        
-        # Wind and slope effects
-        wind_slope_factor = 1 + (wind / 20.0) + (slope / 45.0)
-        
-        bi = base_bi * wind_slope_factor
-        return min(1.0, max(0.0, bi))
+        _, _, bi = self._derived_indices(env_data)
+        return bi
+    
+    def _derived_indices(self, env_data: EnvironmentalData) -> Tuple[float, float, float]:
+        """Calculate FWI, ERC and BI clipped to 0-1."""
+        return tuple(
+            min(1.0, max(0.0, index))
+            for index in _derived_index_kernel(
+                env_data.temperature_c, env_data.relative_humidity,
+                env_data.wind_speed_mps, env_data.slope_deg
+            )
+        )
     
     def _calculate_confidence(self, env_data: EnvironmentalData) -> float:
         """Calculate confidence in risk score."""
-        confidence = 1.0
-        
-        # Reduce confidence for missing data
-        if env_data.fuel_model == 0:
-            confidence *= 0.8
-        if env_data.soil_moisture == 0:
-            confidence *= 0.9
-        if env_data.fuel_moisture == 0:
-            confidence *= 0.9
-        if env_data.wind_speed_mps == 0:
-            confidence *= 0.8
-        
-        # Reduce confidence for extreme values (may indicate data quality issues)
-        if env_data.temperature_c < -20 or env_data.temperature_c > 60:
-            confidence *= 0.7
-        if env_data.relative_humidity < 5 or env_data.relative_humidity > 100:
-            confidence *= 0.7
-        
-        return confidence
+        return _confidence_kernel(
+            env_data.fuel_model, env_data.soil_moisture, env_data.fuel_moisture,
+            env_data.wind_speed_mps, env_data.temperature_c, env_data.relative_humidity
+        )
     
     def _calculate_contributing_factors(self, features: List[float]) -> Dict[str, float]:
         """Calculate contributing factors to risk score."""
         if not self.is_trained:
             return {}
         
-        feature_names = self._get_feature_names()
-        factors = {}
-        
-        for i, (name, importance) in enumerate(zip(feature_names, self.risk_model.coef_[0])):
-            if abs(importance) > 0.1:  # Only include significant factors
-                factors[name] = float(importance * features[i])
-        
-        return factors
+        contributions = self._significant_coefs * np.asarray(features)[self._significant_idx]
+        return dict(zip(self._significant_names, contributions.tolist()))
     
     def _heuristic_risk_score(self, env_data: EnvironmentalData) -> RiskScore:
         """Calculate risk score using heuristic method when model not trained."""
         risk_score = 0.0
         
         # Fuel model risk (Anderson 13 fuel models)
-        fuel_risk = {
-            1: 0.1,   # Short grass
-            2: 0.2,   # Timber with grass
-            3: 0.3,   # Tall grass
-            4: 0.4,   # Chaparral
-            5: 0.5,   # Brush
-            6: 0.6,   # Dormant brush
-            7: 0.7,   # Southern rough
-            8: 0.8,   # Closed timber litter
-            9: 0.9,   # Hardwood litter
-            10: 0.8,  # Timber with litter
-            11: 0.6,  # Light logging slash
-            12: 0.7,  # Medium logging slash
-            13: 0.8   # Heavy logging slash
-        }
-        risk_score += fuel_risk.get(env_data.fuel_model, 0.5) * 0.3
+        fuel_risk = _FUEL_RISK.get(env_data.fuel_model, _DEFAULT_FUEL_RISK)
+        risk_score += fuel_risk * 0.3
         
         # Slope risk
         slope_risk = min(1.0, env_data.slope_deg / 45.0)
@@ -359,7 +522,7 @@ class SensorFusionEngine:
             risk_score=risk_score,
             confidence=0.7,  # Lower confidence for heuristic method
             contributing_factors={
-                "fuel_model": fuel_risk.get(env_data.fuel_model, 0.5),
+                "fuel_model": fuel_risk,
                 "slope": slope_risk,
                 "moisture": moisture_risk,
                 "weather": weather_risk,
@@ -367,3 +530,47 @@ class SensorFusionEngine:
             },
             timestamp=env_data.timestamp
         )
+    
+    def _heuristic_risk_scores_batch(self, env_data_list: List[EnvironmentalData]) -> List[RiskScore]:
+        """Vectorized ``_heuristic_risk_score`` over a batch of records."""
+        column = _environment_columns(env_data_list).__getitem__
+        
+        # Fuel model risk; models outside 1-13 map to the default in slot 0
+        fuel_model = column("fuel_model").astype(np.int64)
+        fuel_risk = _FUEL_RISK_TABLE[np.where((fuel_model >= 1) & (fuel_model <= 13), fuel_model, 0)]
+        
+        slope_risk = np.minimum(1.0, column("slope_deg") / 45.0)
+        moisture_risk = (1.0 - column("soil_moisture")) * 0.5 + (1.0 - column("fuel_moisture")) * 0.5
+        
+        temp_risk = np.clip((column("temperature_c") - 20) / 30.0, 0.0, 1.0)
+        humidity_risk = (100 - column("relative_humidity")) / 100.0
+        wind_risk = np.minimum(1.0, column("wind_speed_mps") / 20.0)
+        weather_risk = (temp_risk + humidity_risk + wind_risk) / 3.0
+        
+        history_risk = np.minimum(1.0, (column("lightning_strikes_24h") + column("historical_ignitions")) / 10.0)
+        
+        risk_score = np.clip(
+            fuel_risk * 0.3 + slope_risk * 0.2 + moisture_risk * 0.2 + weather_risk * 0.2 + history_risk * 0.1,
+            0.0, 1.0
+        )
+        
+        return [
+            RiskScore(
+                latitude=env_data.latitude,
+                longitude=env_data.longitude,
+                risk_score=score,
+                confidence=0.7,  # Lower confidence for heuristic method
+                contributing_factors={
+                    "fuel_model": fuel,
+                    "slope": slope,
+                    "moisture": moisture,
+                    "weather": weather,
+                    "history": history
+                },
+                timestamp=env_data.timestamp
+            )
+            for env_data, score, fuel, slope, moisture, weather, history in zip(
+                env_data_list, risk_score.tolist(), fuel_risk.tolist(), slope_risk.tolist(),
+                moisture_risk.tolist(), weather_risk.tolist(), history_risk.tolist()
+            )
+        ]
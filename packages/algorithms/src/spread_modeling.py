@@ -7,11 +7,32 @@ from typing import List, Tuple, Dict, Optional, Any
 from dataclasses import dataclass
 import math
 import random
-from scipy.spatial.distance import cdist
-from scipy.interpolate import griddata
 
+from ._jit import NUMBA_AVAILABLE, njit, prange
 
-@dataclass
+# Base spread rate (m/s) for fuel models missing from the table
+DEFAULT_BASE_RATE = 0.1
+
+# Kilometers per degree of latitude, and of longitude at the equator (WGS84)
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON_EQUATOR = 111.320
+
+# (dx, dy) offsets of the 8 neighbors of a grid cell
+NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _offset_slices(offset: int) -> Tuple[slice, slice]:
+    """(source, destination) slices moving a raster axis by ``offset`` cells."""
+    if offset >= 0:
+        return slice(0, -offset or None), slice(offset, None)
+    return slice(-offset, None), slice(0, offset)
+
+
+# Per neighbor offset, (source, destination) slices for the x and y axes
+_NEIGHBOR_SLICES = tuple((_offset_slices(dx), _offset_slices(dy)) for dx, dy in NEIGHBOR_OFFSETS)
+
+
+@dataclass(slots=True, frozen=True)
 class SpreadParameters:
     """Parameters for fire spread simulation."""
     ignition_points: List[Tuple[float, float]]  # (lat, lon)
@@ -24,26 +45,84 @@ class SpreadParameters:
     simulation_hours: int = 24
     time_step_minutes: int = 15
     monte_carlo_runs: int = 100
+    compute_isochrones: bool = True  # False leaves SpreadResult.isochrones empty
+    compute_perimeter: bool = True  # False leaves SpreadResult.perimeter empty
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpreadResult:
     """Result of fire spread simulation."""
     simulation_id: str
     isochrones: List[Dict[str, Any]]  # Time contours
-    perimeter: List[Tuple[float, float]]  # Final perimeter
+    perimeter: np.ndarray  # Final perimeter, (N, 2) float64 rows of (lat, lon)
     total_area_hectares: float
     max_spread_rate_mph: float
     confidence: float
     statistics: Dict[str, float]
 
 
+@dataclass
+class _SpreadGrid:
+    """Regular simulation grid anchored at its south-west corner."""
+    west: float
+    south: float
+    cell_size: float
+    width: int
+    height: int
+
+
+@njit("void(i1[:], u4[:], i8, i8, f8, i8)", cache=True)
+def _spread_kernel(burned, fire_front, grid_width, grid_height, base_prob, time_steps):
+    """Burn cells in place on the flat mask, one Monte Carlo draw per neighbor."""
+    front = np.empty(burned.size, dtype=np.uint32)
+    next_front = np.empty(burned.size, dtype=np.uint32)
+    front[:fire_front.size] = fire_front
+    front_size = fire_front.size
+    
+    for step in range(time_steps):
+        count = 0
+        for k in range(front_size):
+            grid_y = front[k] // grid_width
+            grid_x = front[k] - grid_y * grid_width
+            
+            for dx, dy in NEIGHBOR_OFFSETS:
+                new_x = grid_x + dx
+                new_y = grid_y + dy
+                if new_x < 0 or new_x >= grid_width or new_y < 0 or new_y >= grid_height:
+                    continue
+                
+                cell = new_y * grid_width + new_x
+                if burned[cell] == 0 and np.random.random() < base_prob * np.random.random():
+                    burned[cell] = 1
+                    next_front[count] = cell
+                    count += 1
+        
+        if count == 0:
+            break
+        front, next_front = next_front, front
+        front_size = count
+
+
+@njit("void(i1[:, :], u4[:], u4[:], i8, i8, f8, i8)", cache=True, parallel=True)
+def _spread_runs_kernel(burned, fire_front, seeds, grid_width, grid_height, base_prob, time_steps):
+    """
+    Run _spread_kernel on every row of ``burned`` (one Monte Carlo run each) in parallel.
+    
+    Each run reseeds its thread's generator from ``seeds`` first, so results do
+    not depend on how runs are scheduled across threads.
+    """
+    for run in prange(burned.shape[0]):
+        np.random.seed(seeds[run])
+        _spread_kernel(burned[run], fire_front, grid_width, grid_height, base_prob, time_steps)
+
+
 class FireSpreadEngine:
     """Engine for fire spread modeling and prediction."""
     
     def __init__(self, terrain_data: Optional[Dict] = None):
         self.terrain_data = terrain_data or {}
         self.fuel_models = self._initialize_fuel_models()
+        self._base_rates = self._build_base_rate_table(self.fuel_models)
     
     def simulate_spread(self, params: SpreadParameters) -> SpreadResult:
         """
@@ -55,30 +134,29 @@ class FireSpreadEngine:
         Returns:
             Spread simulation result
         """
-        # Run Monte Carlo simulations
-        all_perimeters = []
-        all_areas = []
-        all_spread_rates = []
+        grid = self._build_grid(params)
         
-        for run in range(params.monte_carlo_runs):
-            perimeter, area, max_rate = self._simulate_single_run(params)
-            all_perimeters.append(perimeter)
-            all_areas.append(area)
-            all_spread_rates.append(max_rate)
+        # Run Monte Carlo simulations
+        all_cells, all_areas, max_spread_rate = self._simulate_runs(params, grid)
+        all_spread_rates = np.full(len(all_cells), max_spread_rate)
         
-        # Calculate statistics
-        mean_area = np.mean(all_areas)
-        std_area = np.std(all_areas)
-        mean_spread_rate = np.mean(all_spread_rates)
+        # Calculate statistics; column 0 is area, column 1 is max spread rate
+        stats = np.column_stack([all_areas, all_spread_rates])
+        means = stats.mean(axis=0)
+        stds = stats.std(axis=0)
+        mean_area, mean_spread_rate = means
+        std_area = stds[0]
         
         # Generate isochrones from all runs
-        isochrones = self._generate_isochrones(all_perimeters, params)
+        isochrones = self._generate_isochrones(all_cells, params, grid) if params.compute_isochrones else []
         
         # Calculate final perimeter (union of all runs)
-        final_perimeter = self._calculate_final_perimeter(all_perimeters)
+        final_perimeter = (
+            self._calculate_final_perimeter(all_cells, grid) if params.compute_perimeter else np.empty((0, 2))
+        )
         
         # Calculate confidence based on consistency
-        confidence = self._calculate_confidence(all_areas, all_spread_rates)
+        confidence = self._confidence_from_moments(means, stds)
         
         return SpreadResult(
             simulation_id=f"sim_{random.randint(1000, 9999)}",
@@ -91,88 +169,113 @@ class FireSpreadEngine:
                 "mean_area_hectares": mean_area,
                 "std_area_hectares": std_area,
                 "mean_spread_rate_mph": mean_spread_rate,
-                "max_spread_rate_mph": max(all_spread_rates),
-                "min_spread_rate_mph": min(all_spread_rates),
+                "max_spread_rate_mph": stats[:, 1].max(),
+                "min_spread_rate_mph": stats[:, 1].min(),
                 "runs_completed": params.monte_carlo_runs
             }
         )
     
-    def _simulate_single_run(self, params: SpreadParameters) -> Tuple[List[Tuple[float, float]], float, float]:
-        """Simulate a single fire spread run."""
-        # Initialize fire front
-        fire_front = set(params.ignition_points)
-        burned_cells = set(fire_front)
-        
-        # Convert to grid coordinates
+    def _build_grid(self, params: SpreadParameters) -> _SpreadGrid:
+        """Build the simulation grid covering the ignition points."""
         grid_size = 100  # meters
-        bounds = self._calculate_bounds(params.ignition_points)
-        grid_width = int((bounds[2] - bounds[0]) / grid_size) + 1
-        grid_height = int((bounds[3] - bounds[1]) / grid_size) + 1
+        bounds = self._calculate_point_bounds(params.ignition_points)
+        width = int((bounds[2] - bounds[0]) / grid_size) + 1
+        height = int((bounds[3] - bounds[1]) / grid_size) + 1
+        
+        # Linear cell indices are stored as uint32
+        if width * height >= 2 ** 31:
+            raise ValueError(f"Simulation grid too large: {width}x{height} cells")
+        
+        return _SpreadGrid(
+            west=bounds[0],
+            south=bounds[1],
+            cell_size=grid_size,
+            width=width,
+            height=height
+        )
+    
+    def _simulate_runs(self, params: SpreadParameters, grid: _SpreadGrid) -> Tuple[List[np.ndarray], np.ndarray, float]:
+        """
+        Simulate all Monte Carlo spread runs.
         
-        # Initialize spread rates
-        spread_rates = np.zeros((grid_height, grid_width))
-        max_spread_rate = 0.0
+        Returns:
+            Sorted linear indices of burned cells per run, burned area per run
+            in hectares, and the maximum spread rate (mph), which is the same
+            for every run
+        """
+        grid_width = grid.width
+        grid_height = grid.height
+        runs = params.monte_carlo_runs
+        
+        # Cells are encoded as linear indices (y * width + x); the fire front is
+        # a uint32 index array and each run's burned cells a row of int8 flags.
+        burned = np.zeros((runs, grid_height * grid_width), dtype=np.int8)
+        ignition = np.asarray(params.ignition_points, dtype=np.float64)
+        ignition_x = ((ignition[:, 1] - grid.west) / grid.cell_size).astype(np.uint32)
+        ignition_y = ((ignition[:, 0] - grid.south) / grid.cell_size).astype(np.uint32)
+        fire_front = np.unique(ignition_y * np.uint32(grid_width) + ignition_x)
+        burned[:, fire_front] = 1
+        
+        # Spread rate and base spread probability depend only on params while
+        # terrain is stubbed out, so evaluate them once per simulation instead
+        # of per run, cell or step.
+        ignition_lat, ignition_lon = params.ignition_points[0]
+        spread_rate = self._calculate_spread_rate(ignition_lat, ignition_lon, params, 0)
+        base_prob = self._base_spread_probability(spread_rate)
         
         # Time steps
         time_steps = int(params.simulation_hours * 60 / params.time_step_minutes)
+        max_spread_rate = spread_rate if time_steps > 0 else 0.0
+        
+        if NUMBA_AVAILABLE:
+            # Per-run seeds come from NumPy's global generator, so np.random.seed
+            # makes parallel simulations reproducible
+            seeds = np.random.randint(0, 2 ** 32, size=runs, dtype=np.uint32)
+            _spread_runs_kernel(burned, fire_front, seeds, grid_width, grid_height, base_prob, time_steps)
+        else:
+            self._advance_fire_front(burned, grid, base_prob, time_steps)
+        
+        all_cells = [np.flatnonzero(run_burned).astype(np.uint32) for run_burned in burned]
+        
+        # Calculate area in hectares
+        areas_hectares = np.count_nonzero(burned, axis=1) * (grid.cell_size ** 2) / 10000
+        
+        return all_cells, areas_hectares, max_spread_rate
+    
+    def _advance_fire_front(self, burned: np.ndarray, grid: _SpreadGrid, base_prob: float, time_steps: int):
+        """
+        NumPy fallback for _spread_runs_kernel: burn all runs in place as rasters.
+        
+        ``burned`` is the (runs, cells) flag array; each step shifts the whole
+        (runs, height, width) fire front once per neighbor offset instead of
+        walking front cells in Python.
+        """
+        burned = burned.reshape(-1, grid.height, grid.width).view(np.bool_)
+        fire_front = burned.copy()
+        ignited = np.empty_like(burned)
+        pairs = np.empty_like(burned)
         
         for step in range(time_steps):
-            new_fire_front = set()
+            ignited[:] = False
             
-            for lat, lon in fire_front:
-                # Get grid coordinates
-                grid_x = int((lon - bounds[0]) / grid_size)
-                grid_y = int((lat - bounds[1]) / grid_size)
+            for dx, dy in _NEIGHBOR_SLICES:
+                # Unburned neighbors of front cells at this offset
+                src = (slice(None), dy[0], dx[0])
+                dst = (slice(None), dy[1], dx[1])
+                np.greater(fire_front[src], burned[dst], out=pairs[dst])
                 
-                if 0 <= grid_x < grid_width and 0 <= grid_y < grid_height:
-                    # Calculate spread rate for this cell
-                    spread_rate = self._calculate_spread_rate(
-                        lat, lon, params, step * params.time_step_minutes
-                    )
-                    
-                    spread_rates[grid_y, grid_x] = spread_rate
-                    max_spread_rate = max(max_spread_rate, spread_rate)
-                    
-                    # Spread to neighboring cells
-                    for dx in [-1, 0, 1]:
-                        for dy in [-1, 0, 1]:
-                            if dx == 0 and dy == 0:
-                                continue
-                            
-                            new_x = grid_x + dx
-                            new_y = grid_y + dy
-                            
-                            if (0 <= new_x < grid_width and 
-                                0 <= new_y < grid_height and 
-                                (new_x, new_y) not in burned_cells):
-                                
-                                # Calculate probability of spread
-                                prob = self._calculate_spread_probability(
-                                    lat, lon, new_x, new_y, spread_rate, params
-                                )
-                                
-                                if random.random() < prob:
-                                    new_lat = bounds[1] + new_y * grid_size
-                                    new_lon = bounds[0] + new_x * grid_size
-                                    new_fire_front.add((new_lat, new_lon))
-                                    burned_cells.add((new_x, new_y))
+                # Monte Carlo draw per (front cell, neighbor) pair
+                target = pairs[dst]
+                n = np.count_nonzero(target)
+                if n:
+                    draws = np.random.random(n) < base_prob * np.random.random(n)
+                    ignited[dst][target] |= draws
             
-            fire_front = new_fire_front
+            burned |= ignited
+            fire_front, ignited = ignited, fire_front
             
-            if not fire_front:
+            if not fire_front.any():
                 break
-        
-        # Convert burned cells back to lat/lon
-        perimeter = []
-        for grid_x, grid_y in burned_cells:
-            lat = bounds[1] + grid_y * grid_size
-            lon = bounds[0] + grid_x * grid_size
-            perimeter.append((lat, lon))
-        
-        # Calculate area in hectares
-        area_hectares = len(burned_cells) * (grid_size ** 2) / 10000
-        
-        return perimeter, area_hectares, max_spread_rate
     
     def _calculate_spread_rate(self, lat: float, lon: float, params: SpreadParameters, time_minutes: int) -> float:
         """Calculate spread rate using Rothermel model."""
@@ -180,7 +283,7 @@ class FireSpreadEngine:
         slope, aspect = self._get_terrain_data(lat, lon)
         
         # Base spread rate from fuel model
-        base_rate = self.fuel_models.get(params.fuel_model, {}).get('base_rate', 0.1)  # m/s
+        base_rate = self._base_rate(params.fuel_model)  # m/s
         
         # Wind effect
         wind_factor = self._calculate_wind_factor(
@@ -268,6 +371,13 @@ class FireSpreadEngine:
     def _calculate_spread_probability(self, lat: float, lon: float, grid_x: int, grid_y: int,
                                     spread_rate: float, params: SpreadParameters) -> float:
         """Calculate probability of fire spreading to a neighboring cell."""
+        # Random factor for Monte Carlo
+        random_factor = random.random()
+        
+        return self._base_spread_probability(spread_rate) * random_factor
+    
+    def _base_spread_probability(self, spread_rate: float) -> float:
+        """Calculate the deterministic part of the spread probability."""
         # Base probability from spread rate
         base_prob = min(1.0, spread_rate / 10.0)  # Normalize to 0-1
         
@@ -275,10 +385,7 @@ class FireSpreadEngine:
         distance = math.sqrt(2) * 100  # Diagonal distance in meters
         distance_factor = 1.0 / (1.0 + distance / 1000.0)
         
-        # Random factor for Monte Carlo
-        random_factor = random.random()
-        
-        return base_prob * distance_factor * random_factor
+        return base_prob * distance_factor
     
     def _get_terrain_data(self, lat: float, lon: float) -> Tuple[float, float]:
         """Get terrain data for a location."""
@@ -286,67 +393,107 @@ class FireSpreadEngine:
         # For now, return default values
         return 0.0, 0.0  # slope, aspect
     
-    def _calculate_bounds(self, points: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
+    def _calculate_bounds(self, lat, lon, radius_km: float) -> Tuple[float, float, float, float]:
+        """
+        Calculate the (west, south, east, north) box reaching ``radius_km`` around a point.
+        
+        A degree of longitude shrinks with cos(latitude), so the east-west
+        half-width is scaled per latitude rather than using 111 km for both
+        axes. ``lat`` and ``lon`` may also be arrays of points.
+        """
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LON_EQUATOR * np.cos(np.radians(lat)))
+        return lon - dlon, lat - dlat, lon + dlon, lat + dlat
+    
+    def _calculate_point_bounds(self, points: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
         """Calculate bounding box for points."""
         lats = [p[0] for p in points]
         lons = [p[1] for p in points]
         return min(lons), min(lats), max(lons), max(lats)
     
-    def _generate_isochrones(self, all_perimeters: List[List[Tuple[float, float]]], 
-                            params: SpreadParameters) -> List[Dict[str, Any]]:
+    def _generate_isochrones(self, all_cells: List[np.ndarray], params: SpreadParameters,
+                            grid: _SpreadGrid) -> List[Dict[str, Any]]:
         """Generate isochrones from multiple simulation runs."""
         isochrones = []
         
         # Create time intervals
         time_intervals = [6, 12, 18, 24]  # hours
         
+        # Find cells that burned in any run
+        # Simple approximation - in production would track burn times
+        burned_cells = self._union_cells(all_cells)
+        if burned_cells.size == 0:
+            return isochrones
+        geometry = self._cells_to_points(burned_cells, grid)
+        
         for hours in time_intervals:
             if hours > params.simulation_hours:
                 continue
             
-            # Find cells that burned within this time
-            burned_cells = set()
-            for perimeter in all_perimeters:
-                # Simple approximation - in production would track burn times
-                if len(perimeter) > 0:
-                    burned_cells.update(perimeter)
-            
-            if burned_cells:
-                isochrone = {
-                    "hours_from_start": hours,
-                    "geometry": list(burned_cells),
-                    "area_hectares": len(burned_cells) * 0.01,  # Approximate
-                    "perimeter_km": len(burned_cells) * 0.1  # Approximate
-                }
-                isochrones.append(isochrone)
+            isochrone = {
+                "hours_from_start": hours,
+                "geometry": geometry,
+                "area_hectares": burned_cells.size * 0.01,  # Approximate
+                "perimeter_km": burned_cells.size * 0.1  # Approximate
+            }
+            isochrones.append(isochrone)
         
         return isochrones
     
-    def _calculate_final_perimeter(self, all_perimeters: List[List[Tuple[float, float]]]) -> List[Tuple[float, float]]:
-        """Calculate final perimeter from all simulation runs."""
-        if not all_perimeters:
-            return []
+    def _calculate_final_perimeter(self, all_cells: List[np.ndarray], grid: _SpreadGrid) -> np.ndarray:
+        """Calculate final perimeter from all simulation runs as (N, 2) (lat, lon) rows."""
+        if not all_cells:
+            return np.empty((0, 2))
         
         # Simple union of all perimeters
-        all_points = set()
-        for perimeter in all_perimeters:
-            all_points.update(perimeter)
-        
-        return list(all_points)
+        return self._cells_to_points(self._union_cells(all_cells), grid)
+    
+    def _union_cells(self, all_cells: List[np.ndarray]) -> np.ndarray:
+        """Union of linear cell indices across runs (sorted, deduplicated)."""
+        if not all_cells:
+            return np.empty(0, dtype=np.uint32)
+        return np.unique(np.concatenate(all_cells))
     
-    def _calculate_confidence(self, areas: List[float], spread_rates: List[float]) -> float:
-        """Calculate confidence in simulation results."""
-        if not areas or not spread_rates:
+    def _cells_to_points(self, cells: np.ndarray, grid: _SpreadGrid) -> np.ndarray:
+        """Decode linear cell indices to an (N, 2) array of (lat, lon) points."""
+        cell_y, cell_x = np.divmod(cells, grid.width)
+        points = np.empty((cells.size, 2))
+        np.multiply(cell_y, grid.cell_size, out=points[:, 0])
+        np.multiply(cell_x, grid.cell_size, out=points[:, 1])
+        points += (grid.south, grid.west)
+        return points
+    
+    def _calculate_confidence(self, areas: np.ndarray, spread_rates: np.ndarray) -> float:
+        """Calculate confidence in simulation results (arrays or lists per run)."""
+        if len(areas) == 0 or len(spread_rates) == 0:
             return 0.0
         
+        stats = np.column_stack([areas, spread_rates])
+        return self._confidence_from_moments(stats.mean(axis=0), stats.std(axis=0))
+    
+    def _confidence_from_moments(self, means: np.ndarray, stds: np.ndarray) -> float:
+        """Confidence from per-column (area, spread rate) means and standard deviations."""
         # Calculate coefficient of variation
-        area_cv = np.std(areas) / np.mean(areas) if np.mean(areas) > 0 else 1.0
-        rate_cv = np.std(spread_rates) / np.mean(spread_rates) if np.mean(spread_rates) > 0 else 1.0
+        area_cv = stds[0] / means[0] if means[0] > 0 else 1.0
+        rate_cv = stds[1] / means[1] if means[1] > 0 else 1.0
         
         # Lower CV = higher confidence
         confidence = 1.0 - (area_cv + rate_cv) / 2.0
         return max(0.0, min(1.0, confidence))
     
+    def _base_rate(self, fuel_model: int) -> float:
+        """Look up the base spread rate (m/s) for a fuel model."""
+        if 0 <= fuel_model < len(self._base_rates):
+            return float(self._base_rates[fuel_model])
+        return DEFAULT_BASE_RATE
+    
+    def _build_base_rate_table(self, fuel_models: Dict[int, Dict[str, float]]) -> np.ndarray:
+        """Build a base-rate array indexed directly by fuel model number."""
+        table = np.full(max(fuel_models) + 1, DEFAULT_BASE_RATE, dtype=np.float64)
+        for model_id, model_data in fuel_models.items():
+            table[model_id] = model_data["base_rate"]
+        return table
+    
     def _initialize_fuel_models(self) -> Dict[int, Dict[str, float]]:
         """Initialize Anderson 13 fuel model parameters."""
         return {
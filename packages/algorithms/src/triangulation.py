@@ -2,15 +2,20 @@
 Bearing-only triangulation algorithms for smoke localization.
 """
 
+import itertools
+import operator
+import os
+import threading
 import numpy as np
-from typing import List, Tuple, Optional, Dict, Any
-from dataclasses import dataclass
-from scipy.optimize import minimize
-from scipy.spatial.distance import cdist
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional, Dict, Sequence
+from dataclasses import dataclass, replace
 import math
 
+from ._jit import NUMBA_AVAILABLE, njit, prange
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class BearingObservation:
     """A bearing observation from a camera/device."""
     device_id: str
@@ -24,7 +29,7 @@ class BearingObservation:
     detection_id: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TriangulationResult:
     """Result of triangulation calculation."""
     latitude: float
@@ -37,12 +42,397 @@ class TriangulationResult:
     quality_metrics: Dict[str, float]
 
 
+def _ransac_trial_count(inlier_ratio: float, sample_size: int, confidence: float) -> float:
+    """
+    Number of RANSAC trials needed to draw at least one all-inlier sample.
+    
+    Solves 1 - (1 - w^s)^k >= p for k, as in the standard adaptive RANSAC
+    stopping criterion.
+    """
+    all_inlier = inlier_ratio ** sample_size
+    if all_inlier >= 1.0:
+        return 1
+    if all_inlier <= 0.0:
+        return math.inf
+    return math.ceil(math.log(1.0 - confidence) / math.log(1.0 - all_inlier))
+
+
+def _batch_latlon_to_cartesian(lats: np.ndarray, lons: np.ndarray, alts: np.ndarray,
+                               earth_radius: float) -> np.ndarray:
+    """Convert arrays of lat/lon/alt to an (N, 3) array of Cartesian coordinates."""
+    lat_rad = np.radians(lats)
+    lon_rad = np.radians(lons)
+    r = earth_radius + alts
+    r_cos_lat = r * np.cos(lat_rad)
+    
+    # Write columns straight into the result rather than stacking temporaries
+    out = np.empty((len(r), 3))
+    np.multiply(r_cos_lat, np.cos(lon_rad), out=out[:, 0])
+    np.multiply(r_cos_lat, np.sin(lon_rad), out=out[:, 1])
+    np.multiply(r, np.sin(lat_rad), out=out[:, 2])
+    return out
+
+
+def _batch_cartesian_to_latlon(points: np.ndarray, earth_radius: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert an (N, 3) array of Cartesian coordinates to lat/lon/alt arrays."""
+    x, y, z = points[..., 0], points[..., 1], points[..., 2]
+    r = np.sqrt(x * x + y * y + z * z)
+    return np.degrees(np.arcsin(z / r)), np.degrees(np.arctan2(y, x)), r - earth_radius
+
+
+def _batch_bearing_to_direction(bearings: np.ndarray, pitches: np.ndarray,
+                                lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Convert bearings and pitches to (N, 3) unit direction vectors.
+    
+    Directions are rotated from each observer's local east/north/up frame into
+    the Earth-centered frame used for observer positions, so rays from
+    different observers can be intersected.
+    """
+    bearing_rad = np.radians(bearings)
+    pitch_rad = np.radians(pitches)
+    east = np.sin(bearing_rad) * np.cos(pitch_rad)
+    north = np.cos(bearing_rad) * np.cos(pitch_rad)
+    up = np.sin(pitch_rad)
+    
+    lat_rad = np.radians(lats)
+    lon_rad = np.radians(lons)
+    sin_lat, cos_lat = np.sin(lat_rad), np.cos(lat_rad)
+    sin_lon, cos_lon = np.sin(lon_rad), np.cos(lon_rad)
+    
+    x = -sin_lon * east - sin_lat * cos_lon * north + cos_lat * cos_lon * up
+    y = cos_lon * east - sin_lat * sin_lon * north + cos_lat * sin_lon * up
+    z = cos_lat * north + sin_lat * up
+    return np.stack([x, y, z], axis=-1)
+
+
+def _batch_ray_intersection(p1: np.ndarray, d1: np.ndarray, p2: np.ndarray, d2: np.ndarray,
+                            max_gap: float = 1000.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ray intersection over stacked (M, 3) ray pairs.
+    
+    Returns:
+        Midpoints of closest approach (M, 3) and a mask of pairs that are not
+        parallel and pass within max_gap meters of each other
+    """
+    w0 = p1 - p2
+    a = np.einsum("ij,ij->i", d1, d1)
+    b = np.einsum("ij,ij->i", d1, d2)
+    c = np.einsum("ij,ij->i", d2, d2)
+    d = np.einsum("ij,ij->i", d1, w0)
+    e = np.einsum("ij,ij->i", d2, w0)
+    
+    denom = a * c - b * b
+    valid = np.abs(denom) >= 1e-10
+    denom = np.where(valid, denom, 1.0)
+    
+    t1 = (b * e - c * d) / denom
+    t2 = (a * e - b * d) / denom
+    intersection1 = p1 + t1[:, None] * d1
+    intersection2 = p2 + t2[:, None] * d2
+    
+    valid &= np.linalg.norm(intersection1 - intersection2, axis=1) <= max_gap
+    return (intersection1 + intersection2) / 2, valid
+
+
+def _batch_inlier_mask(P: np.ndarray, D: np.ndarray, lats: np.ndarray, lons: np.ndarray,
+                       bearings: np.ndarray, pair_i: np.ndarray, pair_j: np.ndarray,
+                       earth_radius: float, threshold: float = 5.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    NumPy counterpart of _ransac_pair_kernel.
+    
+    Returns:
+        (pairs, observations) mask of observations whose bearing is within
+        threshold degrees of each pair's intersection, with rows for pairs
+        without a valid intersection all False, and the (pairs, 3)
+        intersection points
+    """
+    points, valid = _batch_ray_intersection(P[pair_i], D[pair_i], P[pair_j], D[pair_j])
+    cand_lats, cand_lons, _ = _batch_cartesian_to_latlon(points, earth_radius)
+    
+    # (candidates, observations) bearing errors
+    expected = _batch_bearing(lats[None, :], lons[None, :], cand_lats[:, None], cand_lons[:, None])
+    return (_batch_angle_difference(bearings[None, :], expected) < threshold) & valid[:, None], points
+
+
+def _haversine_vec(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray,
+                   earth_radius: float = 6371000.0) -> np.ndarray:
+    """Broadcasting great-circle distance in meters."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    a = np.sin(np.radians(lat2 - lat1) / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    return earth_radius * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _angular_spread(bearings: np.ndarray) -> float:
+    """Largest gap between sorted bearings, including the wrap from last to first."""
+    if len(bearings) < 2:
+        return 0.0
+    
+    bearings = np.sort(bearings)
+    gaps = np.diff(bearings, append=bearings[0] + 360)
+    return float(gaps.max())
+
+
+def _batch_bearing(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Broadcasting version of TriangulationEngine._calculate_bearing (degrees, 0-360)."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lon = np.radians(lon2 - lon1)
+    
+    y = np.sin(delta_lon) * np.cos(lat2_rad)
+    x = np.cos(lat1_rad) * np.sin(lat2_rad) - np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(delta_lon)
+    return np.degrees(np.arctan2(y, x)) % 360.0
+
+
+def _batch_angle_difference(angle1: np.ndarray, angle2: np.ndarray) -> np.ndarray:
+    """Broadcasting version of TriangulationEngine._angle_difference."""
+    return np.abs((angle1 - angle2 + 180.0) % 360.0 - 180.0)
+
+
+@dataclass
+class _ObservationArrays:
+    """Per-call structure-of-arrays view of filtered observations."""
+    lats: np.ndarray
+    lons: np.ndarray
+    bearings: np.ndarray
+    confidences: np.ndarray
+    positions: np.ndarray   # (N, 3) Cartesian camera positions
+    directions: np.ndarray  # (N, 3) Cartesian unit ray directions
+    
+    def take(self, idx: np.ndarray) -> "_ObservationArrays":
+        """Rows idx of every array."""
+        return _ObservationArrays(
+            lats=self.lats[idx],
+            lons=self.lons[idx],
+            bearings=self.bearings[idx],
+            confidences=self.confidences[idx],
+            positions=self.positions[idx],
+            directions=self.directions[idx],
+        )
+    
+    @classmethod
+    def summary(cls, observations: List[BearingObservation]) -> "_ObservationArrays":
+        """Arrays for confidence metrics only; positions and directions are left empty."""
+        columns = _observation_columns(observations)
+        empty = np.empty((0, 3))
+        return cls(
+            lats=columns["latitude"],
+            lons=columns["longitude"],
+            bearings=columns["bearing"],
+            confidences=columns["confidence"],
+            positions=empty,
+            directions=empty,
+        )
+    
+    @classmethod
+    def from_observations(cls, observations: List[BearingObservation],
+                          earth_radius: float) -> "_ObservationArrays":
+        columns = _observation_columns(observations)
+        lats = columns["latitude"]
+        lons = columns["longitude"]
+        bearings = columns["bearing"]
+        return cls(
+            lats=lats,
+            lons=lons,
+            bearings=bearings,
+            confidences=columns["confidence"],
+            positions=_batch_latlon_to_cartesian(lats, lons, columns["altitude"], earth_radius),
+            directions=_batch_bearing_to_direction(bearings, columns["camera_pitch"], lats, lons),
+        )
+
+
+_OBSERVATION_FIELDS = ("latitude", "longitude", "altitude", "camera_pitch", "bearing", "confidence")
+_get_observation_fields = operator.attrgetter(*_OBSERVATION_FIELDS)
+
+
+def _observation_columns(observations: Sequence[BearingObservation]) -> Dict[str, np.ndarray]:
+    """
+    Contiguous float64 column per numeric field of a batch of observations.
+    
+    Each observation is read by one ``attrgetter`` call, so the list is walked
+    once rather than once per field.
+    """
+    values = np.fromiter(
+        itertools.chain.from_iterable(map(_get_observation_fields, observations)),
+        dtype=np.float64, count=len(observations) * len(_OBSERVATION_FIELDS)
+    )
+    columns = np.ascontiguousarray(values.reshape(-1, len(_OBSERVATION_FIELDS)).T)
+    return dict(zip(_OBSERVATION_FIELDS, columns))
+
+
+_DEG2RAD = math.pi / 180.0
+_RAD2DEG = 180.0 / math.pi
+
+# A method result above this confidence is returned without trying the costlier ones
+EARLY_EXIT_CONFIDENCE = 0.9
+
+# Probability that adaptive RANSAC draws at least one all-inlier sample
+RANSAC_CONFIDENCE = 0.99
+
+# RANSAC estimates whose squared bearing errors over the inliers sum below
+# this (degrees^2) are not refined further by least squares
+RANSAC_CONVERGED_RESIDUAL = 1.0
+
+# Observer pairs closer than this are too short a baseline to hypothesize from
+RANSAC_MIN_BASELINE_METERS = 100.0
+
+# Ray pairs scored per RANSAC batch; inputs with fewer pairs are searched exhaustively
+RANSAC_BATCH_SIZE = 256
+
+# Below this many candidate pairs per worker, thread dispatch costs more than it saves
+RANSAC_MIN_PAIRS_PER_THREAD = 64
+
+
+@njit("f8(f8, f8, f8, f8)", cache=True, fastmath=True)
+def _bearing_kernel(lat1, lon1, lat2, lon2):
+    """Initial great-circle bearing from point 1 to point 2 (degrees, 0-360)."""
+    lat1_rad = lat1 * _DEG2RAD
+    lat2_rad = lat2 * _DEG2RAD
+    delta_lon = (lon2 - lon1) * _DEG2RAD
+    
+    y = math.sin(delta_lon) * math.cos(lat2_rad)
+    x = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(delta_lon)
+    
+    bearing = math.atan2(y, x) * _RAD2DEG
+    if bearing < 0:
+        bearing += 360
+    return bearing
+
+
+@njit("f8(f8, f8)", cache=True, fastmath=True)
+def _angle_difference_kernel(angle1, angle2):
+    """Absolute difference between two angles in degrees, handling wrapping."""
+    return abs(((angle1 - angle2 + 180.0) % 360.0) - 180.0)
+
+
+@njit("f8(f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _haversine_kernel(lat1, lon1, lat2, lon2, earth_radius):
+    """Great-circle distance in meters."""
+    lat1_rad = lat1 * _DEG2RAD
+    lat2_rad = lat2 * _DEG2RAD
+    delta_lat = (lat2 - lat1) * _DEG2RAD
+    delta_lon = (lon2 - lon1) * _DEG2RAD
+    
+    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    return earth_radius * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+@njit("void(f8[:, :], f8[:, :], f8[:], f8[:], f8[:], i8, i8, f8, f8, f8, f8[:, :], b1[:, :], i8)",
+      cache=True, fastmath=True)
+def _score_pair_kernel(P, D, lats, lons, bearings, i, j, earth_radius, max_gap, threshold,
+                       points, inliers, k):
+    """
+    Intersect rays i and j and mark observations consistent with the result.
+    
+    Fills points[k] with the pair's intersection and inliers[k, n] with whether
+    observation n's bearing is within threshold degrees of the candidate.
+    The row is left all False for parallel or non-intersecting rays.
+    """
+    a = 0.0
+    b = 0.0
+    c = 0.0
+    d = 0.0
+    e = 0.0
+    for axis in range(3):
+        w0 = P[i, axis] - P[j, axis]
+        a += D[i, axis] * D[i, axis]
+        b += D[i, axis] * D[j, axis]
+        c += D[j, axis] * D[j, axis]
+        d += D[i, axis] * w0
+        e += D[j, axis] * w0
+    
+    denom = a * c - b * b
+    if abs(denom) < 1e-10:
+        return
+    t1 = (b * e - c * d) / denom
+    t2 = (a * e - b * d) / denom
+    
+    gap = 0.0
+    for axis in range(3):
+        q1 = P[i, axis] + t1 * D[i, axis]
+        q2 = P[j, axis] + t2 * D[j, axis]
+        gap += (q1 - q2) * (q1 - q2)
+        points[k, axis] = (q1 + q2) / 2
+    if math.sqrt(gap) > max_gap:
+        return
+    
+    x = points[k, 0]
+    y = points[k, 1]
+    z = points[k, 2]
+    r = math.sqrt(x * x + y * y + z * z)
+    lat = math.asin(z / r) * _RAD2DEG
+    lon = math.atan2(y, x) * _RAD2DEG
+    
+    for n in range(P.shape[0]):
+        expected = _bearing_kernel(lats[n], lons[n], lat, lon)
+        inliers[k, n] = _angle_difference_kernel(bearings[n], expected) < threshold
+
+
+@njit("void(f8[:, :], f8[:, :], f8[:], f8[:], f8[:], i8[:], i8[:], f8, f8, f8, f8[:, :], b1[:, :])",
+      cache=True, fastmath=True, parallel=True)
+def _ransac_pair_kernel(P, D, lats, lons, bearings, pair_i, pair_j, earth_radius, max_gap,
+                        threshold, points, inliers):
+    """
+    Score every candidate ray pair with _score_pair_kernel, spread over Numba's threads.
+    
+    Must not be entered from several Python threads at once: Numba's default
+    workqueue threading layer aborts the process on concurrent launches.
+    """
+    for k in prange(pair_i.shape[0]):
+        _score_pair_kernel(P, D, lats, lons, bearings, pair_i[k], pair_j[k], earth_radius, max_gap,
+                           threshold, points, inliers, k)
+
+
+@njit("void(f8[:, :], f8[:, :], f8[:], f8[:], f8[:], i8[:], i8[:], f8, f8, f8, f8[:, :], b1[:, :])",
+      cache=True, fastmath=True, nogil=True)
+def _ransac_pair_kernel_serial(P, D, lats, lons, bearings, pair_i, pair_j, earth_radius, max_gap,
+                               threshold, points, inliers):
+    """
+    Single-threaded _ransac_pair_kernel that releases the GIL.
+    
+    Safe to run from several Python threads at once, so callers that already
+    parallelize across threads use it instead of the parallel kernel.
+    """
+    for k in range(pair_i.shape[0]):
+        _score_pair_kernel(P, D, lats, lons, bearings, pair_i[k], pair_j[k], earth_radius, max_gap,
+                           threshold, points, inliers, k)
+
+
 class TriangulationEngine:
     """Engine for bearing-only triangulation."""
     
-    def __init__(self, max_distance_km: float = 50.0):
+    def __init__(self, max_distance_km: float = 50.0, ransac_threads: Optional[int] = None,
+                 seed: Optional[int] = None):
         self.max_distance_km = max_distance_km
         self.earth_radius = 6371000  # meters
+        if ransac_threads is None:
+            ransac_threads = int(os.getenv("SENTINEL_RANSAC_THREADS", "1"))
+        self.ransac_threads = max(1, ransac_threads)
+        self._ransac_executor: Optional[ThreadPoolExecutor] = None
+        self._ransac_executor_lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)  # Shuffles RANSAC pair order on large inputs
+    
+    def __enter__(self) -> "TriangulationEngine":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Shut down the RANSAC worker pool; a later call recreates it on demand."""
+        with self._ransac_executor_lock:
+            executor, self._ransac_executor = self._ransac_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def _get_ransac_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the worker pool used to score RANSAC hypotheses."""
+        # Locked because triangulate_batch may reach here from several threads
+        with self._ransac_executor_lock:
+            if self._ransac_executor is None:
+                self._ransac_executor = ThreadPoolExecutor(max_workers=self.ransac_threads)
+            return self._ransac_executor
     
     def triangulate(self, observations: List[BearingObservation]) -> List[TriangulationResult]:
         """
@@ -54,6 +444,10 @@ class TriangulationEngine:
         Returns:
             List of triangulation results (may be multiple if RANSAC finds outliers)
         """
+        return self._triangulate(observations, parallel=True)
+    
+    def _triangulate(self, observations: List[BearingObservation], parallel: bool) -> List[TriangulationResult]:
+        """triangulate(), scoring RANSAC pairs with the parallel kernel only if parallel is set."""
         if len(observations) < 2:
             return []
         
@@ -62,22 +456,38 @@ class TriangulationEngine:
         if len(valid_obs) < 2:
             return []
         
+        # Positions and ray directions are shared by every method
+        arrays = _ObservationArrays.from_observations(valid_obs, self.earth_radius)
+        
         # Try different methods
         results = []
         
         # Method 1: Simple intersection
-        simple_result = self._simple_intersection(valid_obs)
+        simple_result = self._simple_intersection(valid_obs, arrays)
         if simple_result:
+            if simple_result.confidence > EARLY_EXIT_CONFIDENCE:
+                return [simple_result]
             results.append(simple_result)
         
-        # Method 2: RANSAC for outlier rejection
-        ransac_results = self._ransac_triangulation(valid_obs)
-        results.extend(ransac_results)
-        
-        # Method 3: Least squares optimization
-        ls_result = self._least_squares_triangulation(valid_obs)
-        if ls_result:
-            results.append(ls_result)
+        # Method 2: RANSAC for outlier rejection (needs a third observation to vote)
+        ls_obs, ls_arrays = valid_obs, arrays
+        ransac_converged = False
+        if len(valid_obs) >= 3:
+            ransac_result, inlier_idx = self._ransac_consensus(valid_obs, arrays, parallel=parallel)
+            if ransac_result:
+                if ransac_result.confidence > EARLY_EXIT_CONFIDENCE:
+                    return [ransac_result]
+                results.append(ransac_result)
+                ransac_converged = ransac_result.quality_metrics["residual_error"] < RANSAC_CONVERGED_RESIDUAL
+                # Refine on the consensus set only, so outliers can't pull the solution
+                ls_obs = [valid_obs[k] for k in inlier_idx]
+                ls_arrays = arrays.take(inlier_idx)
+        
+        # Method 3: Least squares optimization (skipped when RANSAC already fits its inliers)
+        if not ransac_converged:
+            ls_result = self._least_squares_triangulation(ls_obs, ls_arrays)
+            if ls_result:
+                results.append(ls_result)
         
         # Return best result based on confidence
         if results:
@@ -85,43 +495,53 @@ class TriangulationEngine:
         
         return []
     
-    def _filter_observations(self, observations: List[BearingObservation]) -> List[BearingObservation]:
-        """Filter observations by confidence and distance."""
-        filtered = []
+    def triangulate_batch(self, groups: Sequence[List[BearingObservation]],
+                          max_workers: Optional[int] = None) -> List[List[TriangulationResult]]:
+        """
+        Triangulate independent detection groups concurrently.
         
-        for obs in observations:
-            if obs.confidence < 0.3:  # Minimum confidence threshold
-                continue
-            
-            # Check if observation is within reasonable distance
-            if self._is_within_distance(obs):
-                filtered.append(obs)
+        Groups run on a thread pool and score RANSAC pairs with the serial,
+        GIL-releasing kernel: the parallel kernel cannot be entered from
+        several threads under Numba's workqueue threading layer. Results are
+        returned in the order of groups.
+        """
+        if len(groups) < 2:
+            return [self.triangulate(observations) for observations in groups]
         
-        return filtered
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda observations: self._triangulate(observations, parallel=False), groups))
+    
+    def _filter_observations(self, observations: List[BearingObservation]) -> List[BearingObservation]:
+        """Filter observations by confidence and distance."""
+        # 0.3 is the minimum confidence threshold
+        return [obs for obs in observations if obs.confidence >= 0.3 and self._is_within_distance(obs)]
     
     def _is_within_distance(self, obs: BearingObservation) -> bool:
         """Check if observation is within maximum distance."""
         # Simple check - in production, would use actual terrain data
         return True
     
-    def _simple_intersection(self, observations: List[BearingObservation]) -> Optional[TriangulationResult]:
+    def _simple_intersection(self, observations: List[BearingObservation],
+                             arrays: Optional[_ObservationArrays] = None) -> Optional[TriangulationResult]:
         """Simple ray intersection method."""
         if len(observations) < 2:
             return None
         
-        # Use first two observations for simple intersection
-        obs1, obs2 = observations[0], observations[1]
+        if arrays is None:
+            arrays = _ObservationArrays.from_observations(observations[:2], self.earth_radius)
         
-        # Convert to Cartesian coordinates
-        p1 = self._latlon_to_cartesian(obs1.latitude, obs1.longitude, obs1.altitude)
-        p2 = self._latlon_to_cartesian(obs2.latitude, obs2.longitude, obs2.altitude)
-        
-        # Calculate direction vectors
-        d1 = self._bearing_to_direction(obs1.bearing, obs1.camera_pitch)
-        d2 = self._bearing_to_direction(obs2.bearing, obs2.camera_pitch)
+        # Use first two observations for simple intersection
+        return self._intersect_pair(observations, arrays, 0, 1)
+    
+    def _intersect_pair(self, observations: List[BearingObservation], arrays: _ObservationArrays,
+                        i: int, j: int, intersection: Optional[np.ndarray] = None) -> Optional[TriangulationResult]:
+        """Intersect the rays of observations i and j, unless the intersection is already known."""
+        obs1, obs2 = observations[i], observations[j]
         
         # Find intersection
-        intersection = self._ray_intersection(p1, d1, p2, d2)
+        if intersection is None:
+            intersection = self._ray_intersection(arrays.positions[i], arrays.directions[i],
+                                                  arrays.positions[j], arrays.directions[j])
         
         if intersection is None:
             return None
@@ -130,120 +550,205 @@ class TriangulationEngine:
         lat, lon, alt = self._cartesian_to_latlon(intersection)
         
         # Calculate confidence based on angular spread and baseline
-        confidence = self._calculate_confidence(observations[:2])
+        confidence, uncertainty, angular_spread, baseline = self._assess_observations(arrays, [i, j])
         
         return TriangulationResult(
             latitude=lat,
             longitude=lon,
             altitude=alt,
             confidence=confidence,
-            uncertainty_meters=self._calculate_uncertainty(observations[:2]),
+            uncertainty_meters=uncertainty,
             observation_ids=[obs1.detection_id, obs2.detection_id],
             method="simple_intersection",
             quality_metrics={
-                "angular_spread": self._calculate_angular_spread(observations[:2]),
-                "baseline_distance": self._calculate_baseline_distance(obs1, obs2)
+                "angular_spread": angular_spread,
+                "baseline_distance": baseline
             }
         )
     
-    def _ransac_triangulation(self, observations: List[BearingObservation]) -> List[TriangulationResult]:
+    def _ransac_triangulation(self, observations: List[BearingObservation],
+                              arrays: Optional[_ObservationArrays] = None) -> List[TriangulationResult]:
         """RANSAC triangulation for outlier rejection."""
-        if len(observations) < 3:
-            return []
+        result, _ = self._ransac_consensus(observations, arrays)
+        return [result] if result else []
+    
+    def _ransac_consensus(self, observations: List[BearingObservation],
+                          arrays: Optional[_ObservationArrays] = None, parallel: bool = True
+                          ) -> Tuple[Optional[TriangulationResult], Optional[np.ndarray]]:
+        """
+        Find the best RANSAC hypothesis.
         
-        best_result = None
-        best_inliers = []
-        best_score = 0
-        
-        # Try different combinations of observations
-        for i in range(len(observations)):
-            for j in range(i + 1, len(observations)):
-                for k in range(j + 1, len(observations)):
-                    subset = [observations[i], observations[j], observations[k]]
-                    result = self._simple_intersection(subset)
-                    
-                    if result is None:
-                        continue
-                    
-                    # Count inliers
-                    inliers = self._count_inliers(result, observations)
-                    score = len(inliers) * result.confidence
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_result = result
-                        best_inliers = inliers
-        
-        if best_result and len(best_inliers) >= 2:
-            # Update result with all inliers
-            best_result.observation_ids = [obs.detection_id for obs in best_inliers]
-            best_result.confidence = self._calculate_confidence(best_inliers)
-            best_result.uncertainty_meters = self._calculate_uncertainty(best_inliers)
-            return [best_result]
+        parallel selects the parallel pair kernel; callers running on worker
+        threads pass False.
         
-        return []
+        Returns:
+            The result updated with its inliers (quality_metrics gains the sum
+            of squared bearing errors over them as residual_error) and the
+            inlier indices into observations, or (None, None)
+        """
+        n = len(observations)
+        if n < 3:
+            return None, None
+        
+        if arrays is None:
+            arrays = _ObservationArrays.from_observations(observations, self.earth_radius)
+        lats, lons, bearings, confidences = arrays.lats, arrays.lons, arrays.bearings, arrays.confidences
+        P, D = arrays.positions, arrays.directions
+        
+        # Each trial intersects the first two rays of a sample, so every
+        # hypothesis comes from a pair (i, j). Pairs are scored in batches in
+        # random order until enough trials have run to have drawn an
+        # all-inlier pair with RANSAC_CONFIDENCE; small inputs are exhaustive.
+        i_all, j_all = np.triu_indices(n, k=1)
+        
+        # Drop degenerate pairs up front: (near-)parallel rays, matching the
+        # intersection's |d1 x d2|^2 < 1e-10 test, and co-located observers
+        cross = np.linalg.norm(np.cross(D[i_all], D[j_all]), axis=1)
+        baseline = np.linalg.norm(P[i_all] - P[j_all], axis=1)
+        good_pair = (cross >= 1e-5) & (baseline > RANSAC_MIN_BASELINE_METERS)
+        if not good_pair.any():
+            return None, None
+        i_all, j_all = i_all[good_pair], j_all[good_pair]
+        order = self._rng.permutation(len(i_all)) if len(i_all) > RANSAC_BATCH_SIZE else np.arange(len(i_all))
+        max_trials = len(order)
+        
+        best_score = 0.0
+        best_pair: Optional[Tuple[int, int]] = None
+        best_mask: Optional[np.ndarray] = None
+        best_point: Optional[np.ndarray] = None
+        trials = 0
+        while trials < max_trials:
+            batch = order[trials:trials + RANSAC_BATCH_SIZE]
+            trials += len(batch)
+            i_idx, j_idx = i_all[batch], j_all[batch]
+            
+            inlier_mask, points = self._pair_inlier_mask(P, D, lats, lons, bearings, i_idx, j_idx, parallel)
+            scores = inlier_mask.sum(axis=1) * self._pair_confidence(lats, lons, bearings, confidences, i_idx, j_idx)
+            k = int(np.argmax(scores))
+            if scores[k] > best_score:
+                best_score = float(scores[k])
+                best_pair = (int(i_idx[k]), int(j_idx[k]))
+                best_mask = inlier_mask[k]
+                best_point = points[k]
+                inlier_ratio = best_mask.sum() / n
+                max_trials = min(max_trials, _ransac_trial_count(inlier_ratio, 2, RANSAC_CONFIDENCE))
+        
+        if best_pair is None:
+            return None, None
+        inlier_idx = np.flatnonzero(best_mask)
+        best_inliers = [observations[k] for k in inlier_idx]
+        if len(best_inliers) < 2:
+            return None, None
+        
+        # The pair's intersection was already solved while scoring
+        best_result = self._intersect_pair(observations, arrays, *best_pair, intersection=best_point)
+        if best_result is None:
+            return None, None
+        
+        errors = _batch_angle_difference(
+            bearings[inlier_idx],
+            _batch_bearing(lats[inlier_idx], lons[inlier_idx], best_result.latitude, best_result.longitude)
+        )
+        
+        # Update result with all inliers
+        confidence, uncertainty, _, _ = self._assess_observations(arrays, inlier_idx)
+        return replace(
+            best_result,
+            observation_ids=[obs.detection_id for obs in best_inliers],
+            confidence=confidence,
+            uncertainty_meters=uncertainty,
+            quality_metrics={**best_result.quality_metrics, "residual_error": float(np.sum(errors ** 2))},
+        ), inlier_idx
+    
+    def _pair_inlier_mask(self, P: np.ndarray, D: np.ndarray, lats: np.ndarray, lons: np.ndarray,
+                          bearings: np.ndarray, i_idx: np.ndarray, j_idx: np.ndarray,
+                          parallel: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(pairs, observations) inlier mask and (pairs, 3) intersections for each ray pair."""
+        if NUMBA_AVAILABLE:
+            points = np.zeros((len(i_idx), 3))
+            inlier_mask = np.zeros((len(i_idx), len(lats)), dtype=np.bool_)
+            kernel = _ransac_pair_kernel if parallel else _ransac_pair_kernel_serial
+            kernel(P, D, lats, lons, bearings, i_idx.astype(np.int64), j_idx.astype(np.int64),
+                   float(self.earth_radius), 1000.0, 5.0, points, inlier_mask)
+            return inlier_mask, points
+        
+        if self.ransac_threads > 1 and len(i_idx) >= self.ransac_threads * RANSAC_MIN_PAIRS_PER_THREAD:
+            # NumPy releases the GIL inside the batched kernels, so chunks of
+            # pairs can be scored concurrently
+            chunks = zip(np.array_split(i_idx, self.ransac_threads), np.array_split(j_idx, self.ransac_threads))
+            masks, points = zip(*self._get_ransac_executor().map(
+                lambda chunk: _batch_inlier_mask(P, D, lats, lons, bearings, chunk[0], chunk[1], self.earth_radius),
+                chunks
+            ))
+            return np.concatenate(masks), np.concatenate(points)
+        
+        return _batch_inlier_mask(P, D, lats, lons, bearings, i_idx, j_idx, self.earth_radius)
     
-    def _least_squares_triangulation(self, observations: List[BearingObservation]) -> Optional[TriangulationResult]:
+    def _pair_confidence(self, lats: np.ndarray, lons: np.ndarray, bearings: np.ndarray,
+                         confidences: np.ndarray, i_idx: np.ndarray, j_idx: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_confidence for two-observation samples."""
+        base_confidence = (confidences[i_idx] + confidences[j_idx]) / 2.0
+        gap = np.abs(bearings[i_idx] - bearings[j_idx])
+        spread_factor = np.minimum(1.0, np.maximum(gap, 360.0 - gap) / 90.0)
+        baseline = _haversine_vec(lats[i_idx], lons[i_idx], lats[j_idx], lons[j_idx], self.earth_radius)
+        baseline_factor = np.minimum(1.0, baseline / 10000.0)
+        return np.clip(base_confidence * 0.4 + spread_factor * 0.3 + baseline_factor * 0.2 + 0.5 * 0.1, 0.0, 1.0)
+    
+    def _least_squares_triangulation(self, observations: List[BearingObservation],
+                                     arrays: Optional[_ObservationArrays] = None) -> Optional[TriangulationResult]:
         """Least squares optimization for triangulation."""
         if len(observations) < 2:
             return None
         
-        # Initial guess from simple intersection
-        initial_result = self._simple_intersection(observations[:2])
-        if initial_result is None:
+        if arrays is None:
+            arrays = _ObservationArrays.from_observations(observations, self.earth_radius)
+        P, D = arrays.positions, arrays.directions
+        weights = arrays.confidences ** 2
+        
+        # Point closest to all rays: minimize sum_i w_i * ||(I - d_i d_i^T)(x - p_i)||^2,
+        # whose normal equations are (sum_i w_i M_i) x = sum_i w_i M_i p_i
+        M = np.eye(3) - D[:, :, None] * D[:, None, :]
+        A = np.einsum("n,nij->ij", weights, M)
+        Mp = np.einsum("nij,nj->ni", M, P)
+        b = weights @ Mp
+        
+        try:
+            x = np.linalg.solve(A, b)
+        except np.linalg.LinAlgError:
             return None
         
-        # Objective function: sum of squared bearing errors
-        def objective(params):
-            lat, lon, alt = params
-            total_error = 0
-            
-            for obs in observations:
-                # Calculate expected bearing from observation point to target
-                expected_bearing = self._calculate_bearing(
-                    obs.latitude, obs.longitude, lat, lon
-                )
-                
-                # Calculate error (handling angle wrapping)
-                error = self._angle_difference(obs.bearing, expected_bearing)
-                total_error += (error * obs.confidence) ** 2
-            
-            return total_error
-        
-        # Minimize objective function
-        result = minimize(
-            objective,
-            [initial_result.latitude, initial_result.longitude, initial_result.altitude],
-            method='BFGS'
-        )
-        
-        if not result.success:
+        # Bearings are rays, not lines: the target must be in front of every camera
+        if np.any(np.einsum("ij,ij->i", D, x - P) <= 0):
             return None
         
-        lat, lon, alt = result.x
+        lat, lon, alt = self._cartesian_to_latlon(x)
+        
+        # Confidence-weighted squared bearing error (deg^2) at the solution
+        errors = _batch_angle_difference(arrays.bearings, _batch_bearing(arrays.lats, arrays.lons, lat, lon))
+        residual_error = float(np.sum((errors * arrays.confidences) ** 2))
         
         # Calculate confidence
-        confidence = self._calculate_confidence(observations)
+        confidence, uncertainty, angular_spread, baseline = self._assess_observations(arrays)
         
         return TriangulationResult(
             latitude=lat,
             longitude=lon,
             altitude=alt,
             confidence=confidence,
-            uncertainty_meters=self._calculate_uncertainty(observations),
+            uncertainty_meters=uncertainty,
             observation_ids=[obs.detection_id for obs in observations],
             method="least_squares",
             quality_metrics={
-                "angular_spread": self._calculate_angular_spread(observations),
-                "baseline_distance": self._calculate_baseline_distance(observations[0], observations[-1]),
-                "residual_error": result.fun
+                "angular_spread": angular_spread,
+                "baseline_distance": baseline,
+                "residual_error": residual_error
             }
         )
     
     def _latlon_to_cartesian(self, lat: float, lon: float, alt: float) -> np.ndarray:
         """Convert lat/lon/alt to Cartesian coordinates."""
-        lat_rad = math.radians(lat)
-        lon_rad = math.radians(lon)
+        lat_rad = lat * _DEG2RAD
+        lon_rad = lon * _DEG2RAD
         
         x = (self.earth_radius + alt) * math.cos(lat_rad) * math.cos(lon_rad)
         y = (self.earth_radius + alt) * math.cos(lat_rad) * math.sin(lon_rad)
@@ -256,36 +761,56 @@ class TriangulationEngine:
         x, y, z = point
         
         r = math.sqrt(x*x + y*y + z*z)
-        lat = math.degrees(math.asin(z / r))
-        lon = math.degrees(math.atan2(y, x))
+        lat = math.asin(z / r) * _RAD2DEG
+        lon = math.atan2(y, x) * _RAD2DEG
         alt = r - self.earth_radius
         
         return lat, lon, alt
     
-    def _bearing_to_direction(self, bearing: float, pitch: float) -> np.ndarray:
-        """Convert bearing and pitch to 3D direction vector."""
-        bearing_rad = math.radians(bearing)
-        pitch_rad = math.radians(pitch)
+    def _bearing_to_direction(self, bearing: float, pitch: float, lat: float, lon: float) -> np.ndarray:
+        """
+        Convert bearing and pitch seen from (lat, lon) to a 3D direction vector.
+        
+        Same Earth-centered frame as _batch_bearing_to_direction, so the vector
+        can be paired with _latlon_to_cartesian positions.
+        """
+        bearing_rad = bearing * _DEG2RAD
+        pitch_rad = pitch * _DEG2RAD
+        
+        # Local east/north/up, with North = 0°, East = 90°
+        east = math.sin(bearing_rad) * math.cos(pitch_rad)
+        north = math.cos(bearing_rad) * math.cos(pitch_rad)
+        up = math.sin(pitch_rad)
         
-        # North = 0°, East = 90°
-        x = math.sin(bearing_rad) * math.cos(pitch_rad)
-        y = math.cos(bearing_rad) * math.cos(pitch_rad)
-        z = math.sin(pitch_rad)
+        lat_rad = lat * _DEG2RAD
+        lon_rad = lon * _DEG2RAD
+        sin_lat, cos_lat = math.sin(lat_rad), math.cos(lat_rad)
+        sin_lon, cos_lon = math.sin(lon_rad), math.cos(lon_rad)
+        
+        x = -sin_lon * east - sin_lat * cos_lon * north + cos_lat * cos_lon * up
+        y = cos_lon * east - sin_lat * sin_lon * north + cos_lat * sin_lon * up
+        z = cos_lat * north + sin_lat * up
         
         return np.array([x, y, z])
     
     def _ray_intersection(self, p1: np.ndarray, d1: np.ndarray, 
-                         p2: np.ndarray, d2: np.ndarray) -> Optional[np.ndarray]:
+                         p2: np.ndarray, d2: np.ndarray) -> Optional[Tuple[float, float, float]]:
         """Find intersection of two rays in 3D space."""
+        # Plain float math: np.dot on 3-vectors costs far more in call overhead than arithmetic
+        p1x, p1y, p1z = p1
+        p2x, p2y, p2z = p2
+        d1x, d1y, d1z = d1
+        d2x, d2y, d2z = d2
+        
         # Calculate the vector between the two points
-        w0 = p1 - p2
+        w0x, w0y, w0z = p1x - p2x, p1y - p2y, p1z - p2z
         
         # Calculate dot products
-        a = np.dot(d1, d1)
-        b = np.dot(d1, d2)
-        c = np.dot(d2, d2)
-        d = np.dot(d1, w0)
-        e = np.dot(d2, w0)
+        a = d1x * d1x + d1y * d1y + d1z * d1z
+        b = d1x * d2x + d1y * d2y + d1z * d2z
+        c = d2x * d2x + d2y * d2y + d2z * d2z
+        d = d1x * w0x + d1y * w0y + d1z * w0z
+        e = d2x * w0x + d2y * w0y + d2z * w0z
         
         # Calculate denominator
         denom = a * c - b * b
@@ -298,125 +823,93 @@ class TriangulationEngine:
         t2 = (a * e - b * d) / denom
         
         # Calculate intersection points
-        intersection1 = p1 + t1 * d1
-        intersection2 = p2 + t2 * d2
+        i1x, i1y, i1z = p1x + t1 * d1x, p1y + t1 * d1y, p1z + t1 * d1z
+        i2x, i2y, i2z = p2x + t2 * d2x, p2y + t2 * d2y, p2z + t2 * d2z
         
         # Check if they're close enough (within 1km)
-        distance = np.linalg.norm(intersection1 - intersection2)
+        distance = math.hypot(i1x - i2x, i1y - i2y, i1z - i2z)
         if distance > 1000:
             return None
         
         # Return average of intersection points
-        return (intersection1 + intersection2) / 2
+        return ((i1x + i2x) / 2, (i1y + i2y) / 2, (i1z + i2z) / 2)
     
     def _calculate_bearing(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate bearing between two points."""
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lon = math.radians(lon2 - lon1)
-        
-        y = math.sin(delta_lon) * math.cos(lat2_rad)
-        x = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(delta_lon)
-        
-        bearing = math.degrees(math.atan2(y, x))
-        if bearing < 0:
-            bearing += 360
-        
-        return bearing
+        return _bearing_kernel(lat1, lon1, lat2, lon2)
     
     def _angle_difference(self, angle1: float, angle2: float) -> float:
         """Calculate difference between two angles, handling wrapping."""
-        diff = angle1 - angle2
-        while diff > 180:
-            diff -= 360
-        while diff < -180:
-            diff += 360
-        return abs(diff)
+        return _angle_difference_kernel(angle1, angle2)
     
     def _calculate_confidence(self, observations: List[BearingObservation]) -> float:
         """Calculate overall confidence from observations."""
         if not observations:
             return 0.0
+        return self._assess_observations(_ObservationArrays.summary(observations))[0]
+    
+    def _calculate_uncertainty(self, observations: List[BearingObservation]) -> float:
+        """Calculate uncertainty in meters."""
+        if len(observations) < 2:
+            return 1000.0  # Default uncertainty
+        return self._assess_observations(_ObservationArrays.summary(observations))[1]
+    
+    def _calculate_angular_spread(self, observations: List[BearingObservation]) -> float:
+        """Calculate angular spread between observations."""
+        return _angular_spread(np.array([obs.bearing for obs in observations]))
+    
+    def _assess_observations(self, arrays: "_ObservationArrays",
+                             idx: Optional[Sequence[int]] = None) -> Tuple[float, float, float, float]:
+        """
+        Confidence, uncertainty, angular spread and baseline for a set of observations.
+        
+        Works on the shared arrays (optionally rows idx) so the angular spread
+        is computed once and no per-observation lists are built.
+        """
+        confidences, bearings = arrays.confidences, arrays.bearings
+        lats, lons = arrays.lats, arrays.lons
+        if idx is not None:
+            confidences, bearings, lats, lons = confidences[idx], bearings[idx], lats[idx], lons[idx]
+        
+        n = len(confidences)
+        if n == 0:
+            return 0.0, 1000.0, 0.0, 0.0
         
         # Base confidence from individual observations
-        base_confidence = np.mean([obs.confidence for obs in observations])
+        base_confidence = confidences.mean()
         
         # Angular spread factor (more spread = higher confidence)
-        angular_spread = self._calculate_angular_spread(observations)
+        angular_spread = _angular_spread(bearings)
         spread_factor = min(1.0, angular_spread / 90.0)  # Normalize to 0-1
         
         # Baseline distance factor (longer baseline = higher confidence)
-        if len(observations) >= 2:
-            baseline = self._calculate_baseline_distance(observations[0], observations[-1])
+        if n >= 2:
+            baseline = _haversine_kernel(lats[0], lons[0], lats[-1], lons[-1], float(self.earth_radius))
             baseline_factor = min(1.0, baseline / 10000.0)  # Normalize to 0-1
         else:
+            baseline = 0.0
             baseline_factor = 0.5
         
         # Number of observations factor
-        count_factor = min(1.0, len(observations) / 4.0)  # Normalize to 0-1
+        count_factor = min(1.0, n / 4.0)  # Normalize to 0-1
         
         # Combine factors
         confidence = base_confidence * 0.4 + spread_factor * 0.3 + baseline_factor * 0.2 + count_factor * 0.1
+        confidence = min(1.0, max(0.0, float(confidence)))
         
-        return min(1.0, max(0.0, confidence))
-    
-    def _calculate_uncertainty(self, observations: List[BearingObservation]) -> float:
-        """Calculate uncertainty in meters."""
-        if len(observations) < 2:
-            return 1000.0  # Default uncertainty
-        
-        # Base uncertainty from angular spread
-        angular_spread = self._calculate_angular_spread(observations)
-        if angular_spread < 30:
-            return 2000.0  # High uncertainty for small angular spread
+        # Uncertainty from angular spread
+        if n < 2:
+            uncertainty = 1000.0  # Default uncertainty
+        elif angular_spread < 30:
+            uncertainty = 2000.0  # High uncertainty for small angular spread
         elif angular_spread < 60:
-            return 1000.0
+            uncertainty = 1000.0
         else:
-            return 500.0
-    
-    def _calculate_angular_spread(self, observations: List[BearingObservation]) -> float:
-        """Calculate angular spread between observations."""
-        if len(observations) < 2:
-            return 0.0
+            uncertainty = 500.0
         
-        bearings = [obs.bearing for obs in observations]
-        bearings.sort()
-        
-        # Calculate gaps between consecutive bearings
-        gaps = []
-        for i in range(len(bearings)):
-            next_i = (i + 1) % len(bearings)
-            gap = bearings[next_i] - bearings[i]
-            if gap < 0:
-                gap += 360
-            gaps.append(gap)
-        
-        return max(gaps)
+        return confidence, uncertainty, angular_spread, baseline
     
     def _calculate_baseline_distance(self, obs1: BearingObservation, obs2: BearingObservation) -> float:
         """Calculate baseline distance between two observations."""
-        lat1_rad = math.radians(obs1.latitude)
-        lat2_rad = math.radians(obs2.latitude)
-        delta_lat = math.radians(obs2.latitude - obs1.latitude)
-        delta_lon = math.radians(obs2.longitude - obs1.longitude)
-        
-        a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        return self.earth_radius * c
-    
-    def _count_inliers(self, result: TriangulationResult, observations: List[BearingObservation]) -> List[BearingObservation]:
-        """Count inliers for RANSAC."""
-        inliers = []
-        threshold = 5.0  # degrees
-        
-        for obs in observations:
-            expected_bearing = self._calculate_bearing(
-                obs.latitude, obs.longitude, result.latitude, result.longitude
-            )
-            error = self._angle_difference(obs.bearing, expected_bearing)
-            
-            if error < threshold:
-                inliers.append(obs)
-        
-        return inliers
+        return _haversine_kernel(obs1.latitude, obs1.longitude, obs2.latitude, obs2.longitude,
+                                 float(self.earth_radius))
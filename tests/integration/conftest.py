@@ -0,0 +1,100 @@
+"""
+Shared fixtures for API integration tests.
+
+The app and database modules are imported inside the fixtures so that
+collection (and each xdist worker start-up) does not build the full app.
+
+Tests marked ``external`` may call real third-party services and are
+deselected by default; run them with ``pytest -m external``.
+"""
+
+import httpx
+import pytest
+import pytest_asyncio
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "external: hits real services outside the app")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Deselect ``external`` tests unless a ``-m`` expression was given."""
+    if config.option.markexpr:
+        return
+    
+    selected = [item for item in items if "external" not in item.keywords]
+    if len(selected) != len(items):
+        config.hook.pytest_deselected(items=[item for item in items if "external" in item.keywords])
+        items[:] = selected
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """Async client shared by the whole session; app startup runs once."""
+    from app.main import app
+    
+    transport = httpx.ASGITransport(app=app)
+    
+    # ASGITransport does not emit lifespan events, so drive them here
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://test",
+            headers={"content-type": "application/json", "accept": "application/json"}
+        ) as c:
+            yield c
+
+
+@pytest.fixture(scope="session")
+def cors_enabled():
+    """Whether the app was built with CORS middleware."""
+    from fastapi.middleware.cors import CORSMiddleware
+    from app.main import app
+    
+    # user_middleware holds Middleware specs, not instances
+    return any(m.cls is CORSMiddleware for m in app.user_middleware)
+
+
+@pytest.fixture(scope="session")
+def db_connection():
+    """One connection whose outer transaction is rolled back after the run."""
+    from app.database import engine
+    
+    connection = engine.connect()
+    transaction = connection.begin()
+    
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def db_session(db_connection):
+    """Session served to every request in place of ``get_db``."""
+    from app.main import app
+    from app.database import SessionLocal, get_db
+    
+    # Endpoint commits only release a SAVEPOINT inside the outer transaction
+    session = SessionLocal(bind=db_connection, join_transaction_mode="create_savepoint")
+    app.dependency_overrides[get_db] = lambda: session
+    
+    try:
+        yield session
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def db_txn(db_connection, db_session):
+    """Wrap each test in a SAVEPOINT that is rolled back at teardown."""
+    # Drop any savepoint the session still holds from wider-scoped fixtures
+    db_session.close()
+    nested = db_connection.begin_nested()
+    
+    yield
+    
+    db_session.close()
+    nested.rollback()
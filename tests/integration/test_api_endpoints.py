@@ -1,218 +1,314 @@
 """
 Integration tests for API endpoints.
+
+Tests are independent and can be sharded across workers with pytest-xdist:
+
+    pytest -n auto --dist=loadfile tests/integration/test_api_endpoints.py
 """
 
+import asyncio
+from dataclasses import asdict, dataclass
+
+import orjson
 import pytest
-import httpx
-from fastapi.testclient import TestClient
-from app.main import app
+import pytest_asyncio
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@dataclass(slots=True, frozen=True)
+class GeoSample:
+    """Device, time and position fields shared by the record payloads."""
+    device_id: str = "test_device_001"
+    timestamp: str = "2024-01-01T00:00:00Z"
+    latitude: float = 40.0
+    longitude: float = -120.0
+
+
+# Detections and alerts are reported slightly northeast of the device
+_DETECTION_SITE = GeoSample(latitude=40.01, longitude=-119.99)
+
+# Request payloads are built and encoded once at import; treat them as read-only
+TELEMETRY_PAYLOAD = {
+    **asdict(GeoSample()),
+    "altitude": 1000.0,
+    "yaw": 0.0,
+    "pitch": 0.0,
+    "roll": 0.0,
+    "speed": 5.0,
+    "battery_level": 85.0,
+    "sensors": [
+        {
+            "name": "temperature",
+            "unit": "celsius",
+            "value": 25.0,
+            "timestamp": "2024-01-01T00:00:00Z"
+        }
+    ],
+    "status": "online",
+    "comms_rssi": -65.0,
+    "temperature": 25.0
+}
+TELEMETRY_BYTES = orjson.dumps(TELEMETRY_PAYLOAD)
+
+DETECTION_PAYLOAD = {
+    **asdict(_DETECTION_SITE),
+    "type": "smoke",
+    "bearing": 45.0,
+    "confidence": 0.85,
+    "media_ref": "video_001_frame_123",
+    "source": "edge",
+    "metadata": {
+        "camera_id": "cam_001",
+        "frame_number": 123
+    }
+}
+DETECTION_BYTES = orjson.dumps(DETECTION_PAYLOAD)
+
+ALERT_PAYLOAD = {
+    **asdict(_DETECTION_SITE),
+    "type": "smoke_detected",
+    "severity": "high",
+    "message": "Smoke detected in sector 7",
+    "detection_id": "det_001"
+}
+ALERT_BYTES = orjson.dumps(ALERT_PAYLOAD)
+
+ACK_BYTES = orjson.dumps({"acknowledged_by": "operator_001"})
+
+TRIANGULATION_PAYLOAD = {
+    "observations": [
+        {
+            "device_id": "camera_001",
+            "timestamp": "2024-01-01T00:00:00Z",
+            "device_latitude": 40.0,
+            "device_longitude": -120.0,
+            "device_altitude": 1000.0,
+            "camera_heading": 0.0,
+            "camera_pitch": 0.0,
+            "bearing": 45.0,
+            "confidence": 0.9,
+            "detection_id": "det_001"
+        },
+        {
+            "device_id": "camera_002",
+            "timestamp": "2024-01-01T00:00:00Z",
+            "device_latitude": 40.1,
+            "device_longitude": -119.9,
+            "device_altitude": 1100.0,
+            "camera_heading": 90.0,
+            "camera_pitch": 0.0,
+            "bearing": 315.0,
+            "confidence": 0.8,
+            "detection_id": "det_002"
+        }
+    ],
+    "max_distance_km": 50.0,
+    "min_confidence": 0.7
+}
+# The apigw triangulation router is optional and has no request model in this
+# tree, so the body is sent as plain JSON
+TRIANGULATION_BYTES = orjson.dumps(TRIANGULATION_PAYLOAD)
+
+PREDICTION_PAYLOAD = {
+    "ignition_points": [
+        {"latitude": 40.0, "longitude": -120.0, "altitude": 1000.0}
+    ],
+    "conditions": {
+        "timestamp": "2024-01-01T00:00:00Z",
+        "latitude": 40.0,
+        "longitude": -120.0,
+        "temperature_c": 30.0,
+        "relative_humidity": 30.0,
+        "wind_speed_mps": 10.0,
+        "wind_direction_deg": 270.0,
+        "fuel_moisture": 0.2,
+        "soil_moisture": 0.3,
+        "fuel_model": 4,
+        "slope_deg": 15.0,
+        "aspect_deg": 180.0,
+        "canopy_cover": 0.3,
+        "elevation_m": 1000.0
+    },
+    "fire_lines": [],
+    "simulation_hours": 12,
+    "time_step_minutes": 15,
+    "monte_carlo_runs": 10
+}
+PREDICTION_BYTES = orjson.dumps(PREDICTION_PAYLOAD)
+
+# base_simulation_id is filled in from the simulate response
+WHATIF_PAYLOAD = {
+    "modifications": [
+        {
+            "type": "wind_change",
+            "parameters": {
+                "wind_speed_mps": 20.0,
+                "wind_direction_deg": 180.0
+            },
+            "description": "Increased wind speed and changed direction"
+        }
+    ],
+    "scenario_name": "High Wind Scenario",
+    "created_by": "test_user"
+}
+
+ARCGIS_PAYLOAD = {
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [-120.0, 40.0]
+            },
+            "properties": {
+                "type": "smoke_detection",
+                "confidence": 0.85,
+                "timestamp": "2024-01-01T00:00:00Z"
+            }
+        }
+    ]
+}
+ARCGIS_BYTES = orjson.dumps(ARCGIS_PAYLOAD)
+
+
+def post_json(c, url, obj):
+    """POST ``obj`` encoded with orjson; pre-encoded bytes are sent as-is.
+
+    JSON headers come from the shared ``client`` fixture.
+    """
+    content = obj if isinstance(obj, bytes) else orjson.dumps(obj)
+    return c.post(url, content=content)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def seeded_telemetry(client, db_session):
+    """Insert five telemetry records once; returns the seeded device ids."""
+    payloads = [
+        {
+            **TELEMETRY_PAYLOAD,
+            **asdict(GeoSample(
+                device_id=f"test_device_{i:03d}",
+                latitude=40.0 + i * 0.01,
+                longitude=-120.0 + i * 0.01
+            ))
+        }
+        for i in range(5)
+    ]
+    
+    # Sequential: every request shares one Session, which is not safe for
+    # interleaved writes
+    for telemetry_data in payloads:
+        response = await post_json(client, "/api/v1/telemetry/", telemetry_data)
+        assert response.status_code == 200
+    
+    return tuple(telemetry_data["device_id"] for telemetry_data in payloads)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def base_simulation(client):
+    """Run the spread simulation once and share its response body."""
+    response = await post_json(client, "/api/v1/prediction/simulate", PREDICTION_BYTES)
+    assert response.status_code == 200
+    
+    return orjson.loads(response.content)
 
 
 class TestAPIIntegration:
     """Integration tests for API endpoints."""
     
-    def setup_method(self):
-        """Set up test client."""
-        self.client = TestClient(app)
-    
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self, client):
         """Test root endpoint."""
-        response = self.client.get("/")
+        response = await client.get("/")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "message" in data
         assert "version" in data
         assert "status" in data
         assert data["status"] == "operational"
     
-    def test_health_check_endpoint(self):
+    async def test_health_check_endpoint(self, client):
         """Test health check endpoint."""
-        response = self.client.get("/health")
+        response = await client.get("/health")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "status" in data
         assert "timestamp" in data
         assert data["status"] == "healthy"
     
-    def test_telemetry_endpoints(self):
-        """Test telemetry endpoints."""
-        # Test creating telemetry
-        telemetry_data = {
-            "device_id": "test_device_001",
-            "timestamp": "2024-01-01T00:00:00Z",
-            "latitude": 40.0,
-            "longitude": -120.0,
-            "altitude": 1000.0,
-            "yaw": 0.0,
-            "pitch": 0.0,
-            "roll": 0.0,
-            "speed": 5.0,
-            "battery_level": 85.0,
-            "sensors": [
-                {
-                    "name": "temperature",
-                    "unit": "celsius",
-                    "value": 25.0,
-                    "timestamp": "2024-01-01T00:00:00Z"
-                }
-            ],
-            "status": "online",
-            "comms_rssi": -65.0,
-            "temperature": 25.0
-        }
-        
-        response = self.client.post("/api/v1/telemetry/", json=telemetry_data)
+    @pytest.mark.parametrize(
+        "path,payload,body,required_keys",
+        [
+            ("/api/v1/telemetry/", TELEMETRY_PAYLOAD, TELEMETRY_BYTES, ("device_id", "latitude", "longitude")),
+            ("/api/v1/detections/", DETECTION_PAYLOAD, DETECTION_BYTES, ("device_id", "type", "confidence")),
+            ("/api/v1/alerts/", ALERT_PAYLOAD, ALERT_BYTES, ("type", "severity")),
+        ],
+        ids=["telemetry", "detections", "alerts"]
+    )
+    async def test_crud_endpoints(self, client, path, payload, body, required_keys):
+        """Test creating a record and listing it back."""
+        # Test creating record
+        response = await post_json(client, path, body)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "id" in data
-        assert data["device_id"] == telemetry_data["device_id"]
-        assert data["latitude"] == telemetry_data["latitude"]
-        assert data["longitude"] == telemetry_data["longitude"]
+        for key in required_keys:
+            assert data[key] == payload[key]
         
-        # Test getting telemetry
-        response = self.client.get("/api/v1/telemetry/")
+        # Test listing records
+        response = await client.get(path)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert isinstance(data, list)
         assert len(data) > 0
+    
+    async def test_telemetry_device_queries(self, client, seeded_telemetry):
+        """Test telemetry lookups by device."""
+        expected_id = seeded_telemetry[0]
         
         # Test getting telemetry by device
-        response = self.client.get(f"/api/v1/telemetry/?device_id={telemetry_data['device_id']}")
+        response = await client.get(f"/api/v1/telemetry/?device_id={expected_id}")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert isinstance(data, list)
-        assert all(item["device_id"] == telemetry_data["device_id"] for item in data)
+        assert {item["device_id"] for item in data} == {expected_id}
         
         # Test getting latest telemetry
-        response = self.client.get(f"/api/v1/telemetry/devices/{telemetry_data['device_id']}/latest")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["device_id"] == telemetry_data["device_id"]
-    
-    def test_detections_endpoints(self):
-        """Test detections endpoints."""
-        # Test creating detection
-        detection_data = {
-            "device_id": "test_device_001",
-            "timestamp": "2024-01-01T00:00:00Z",
-            "type": "smoke",
-            "latitude": 40.01,
-            "longitude": -119.99,
-            "bearing": 45.0,
-            "confidence": 0.85,
-            "media_ref": "video_001_frame_123",
-            "source": "edge",
-            "metadata": {
-                "camera_id": "cam_001",
-                "frame_number": 123
-            }
-        }
-        
-        response = self.client.post("/api/v1/detections/", json=detection_data)
+        response = await client.get(f"/api/v1/telemetry/devices/{expected_id}/latest")
         assert response.status_code == 200
         
-        data = response.json()
-        assert "id" in data
-        assert data["device_id"] == detection_data["device_id"]
-        assert data["type"] == detection_data["type"]
-        assert data["confidence"] == detection_data["confidence"]
-        
-        # Test getting detections
-        response = self.client.get("/api/v1/detections/")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) > 0
+        data = orjson.loads(response.content)
+        assert data["device_id"] == expected_id
     
-    def test_alerts_endpoints(self):
-        """Test alerts endpoints."""
-        # Test creating alert
-        alert_data = {
-            "timestamp": "2024-01-01T00:00:00Z",
-            "type": "smoke_detected",
-            "severity": "high",
-            "message": "Smoke detected in sector 7",
-            "latitude": 40.01,
-            "longitude": -119.99,
-            "device_id": "test_device_001",
-            "detection_id": "det_001"
-        }
-        
-        response = self.client.post("/api/v1/alerts/", json=alert_data)
+    async def test_alert_acknowledge(self, client):
+        """Test acknowledging an alert."""
+        response = await post_json(client, "/api/v1/alerts/", ALERT_BYTES)
         assert response.status_code == 200
         
-        data = response.json()
-        assert "id" in data
-        assert data["type"] == alert_data["type"]
-        assert data["severity"] == alert_data["severity"]
+        data = orjson.loads(response.content)
         assert data["status"] == "active"
         
-        # Test getting alerts
-        response = self.client.get("/api/v1/alerts/")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert isinstance(data, list)
-        assert len(data) > 0
-        
         # Test acknowledging alert
-        alert_id = data[0]["id"]
-        ack_data = {
-            "acknowledged_by": "operator_001"
-        }
-        
-        response = self.client.post(f"/api/v1/alerts/{alert_id}/acknowledge", json=ack_data)
+        response = await post_json(client, f"/api/v1/alerts/{data['id']}/acknowledge", ACK_BYTES)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["status"] == "acknowledged"
         assert data["acknowledged_by"] == "operator_001"
     
-    def test_triangulation_endpoints(self):
+    async def test_triangulation_endpoints(self, client):
         """Test triangulation endpoints."""
         # Test triangulation request
-        triangulation_data = {
-            "observations": [
-                {
-                    "device_id": "camera_001",
-                    "timestamp": "2024-01-01T00:00:00Z",
-                    "device_latitude": 40.0,
-                    "device_longitude": -120.0,
-                    "device_altitude": 1000.0,
-                    "camera_heading": 0.0,
-                    "camera_pitch": 0.0,
-                    "bearing": 45.0,
-                    "confidence": 0.9,
-                    "detection_id": "det_001"
-                },
-                {
-                    "device_id": "camera_002",
-                    "timestamp": "2024-01-01T00:00:00Z",
-                    "device_latitude": 40.1,
-                    "device_longitude": -119.9,
-                    "device_altitude": 1100.0,
-                    "camera_heading": 90.0,
-                    "camera_pitch": 0.0,
-                    "bearing": 315.0,
-                    "confidence": 0.8,
-                    "detection_id": "det_002"
-                }
-            ],
-            "max_distance_km": 50.0,
-            "min_confidence": 0.7
-        }
-        
-        response = self.client.post("/api/v1/triangulation/triangulate", json=triangulation_data)
+        response = await post_json(client, "/api/v1/triangulation/triangulate", TRIANGULATION_BYTES)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "results" in data
         assert "success" in data
         assert data["success"] is True
@@ -224,173 +320,95 @@ class TestAPIIntegration:
         assert "confidence" in result
         assert "uncertainty_meters" in result
     
-    def test_prediction_endpoints(self):
-        """Test prediction endpoints."""
-        # Test spread prediction request
-        prediction_data = {
-            "ignition_points": [
-                {"latitude": 40.0, "longitude": -120.0, "altitude": 1000.0}
-            ],
-            "conditions": {
-                "timestamp": "2024-01-01T00:00:00Z",
-                "latitude": 40.0,
-                "longitude": -120.0,
-                "temperature_c": 30.0,
-                "relative_humidity": 30.0,
-                "wind_speed_mps": 10.0,
-                "wind_direction_deg": 270.0,
-                "fuel_moisture": 0.2,
-                "soil_moisture": 0.3,
-                "fuel_model": 4,
-                "slope_deg": 15.0,
-                "aspect_deg": 180.0,
-                "canopy_cover": 0.3,
-                "elevation_m": 1000.0
-            },
-            "fire_lines": [],
-            "simulation_hours": 12,
-            "time_step_minutes": 15,
-            "monte_carlo_runs": 10
-        }
-        
-        response = self.client.post("/api/v1/prediction/simulate", json=prediction_data)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "simulation_id" in data
-        assert "isochrones" in data
-        assert "perimeter" in data
-        assert "total_area_hectares" in data
-        assert "max_spread_rate_mph" in data
-        assert "confidence" in data
-        
-        # Test what-if scenario
-        whatif_data = {
-            "base_simulation_id": data["simulation_id"],
-            "modifications": [
-                {
-                    "type": "wind_change",
-                    "parameters": {
-                        "wind_speed_mps": 20.0,
-                        "wind_direction_deg": 180.0
-                    },
-                    "description": "Increased wind speed and changed direction"
-                }
-            ],
-            "scenario_name": "High Wind Scenario",
-            "created_by": "test_user"
-        }
+    async def test_simulate(self, base_simulation):
+        """Test spread prediction request."""
+        assert "simulation_id" in base_simulation
+        assert "isochrones" in base_simulation
+        assert "perimeter" in base_simulation
+        assert "total_area_hectares" in base_simulation
+        assert "max_spread_rate_mph" in base_simulation
+        assert "confidence" in base_simulation
+    
+    async def test_whatif(self, client, base_simulation):
+        """Test what-if scenario against the shared base simulation."""
+        whatif_data = {**WHATIF_PAYLOAD, "base_simulation_id": base_simulation["simulation_id"]}
         
-        response = self.client.post("/api/v1/prediction/whatif", json=whatif_data)
+        response = await post_json(client, "/api/v1/prediction/whatif", whatif_data)
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "scenario_id" in data
         assert "base_simulation_id" in data
         assert "scenario_name" in data
         assert "result" in data
         assert "comparison" in data
     
-    def test_integrations_endpoints(self):
+    async def test_integrations_endpoints(self, client):
         """Test integrations endpoints."""
         # Test getting integrations
-        response = self.client.get("/api/v1/integrations/")
+        response = await client.get("/api/v1/integrations/")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert isinstance(data, list)
-        
-        # Test ArcGIS push
-        arcgis_data = {
-            "features": [
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [-120.0, 40.0]
-                    },
-                    "properties": {
-                        "type": "smoke_detection",
-                        "confidence": 0.85,
-                        "timestamp": "2024-01-01T00:00:00Z"
-                    }
-                }
-            ]
-        }
-        
-        response = self.client.post("/api/v1/integrations/arcgis/push", json=arcgis_data)
+    
+    @pytest.mark.external
+    async def test_arcgis_push(self, client):
+        """Test ArcGIS push (may reach the configured ArcGIS service)."""
+        response = await post_json(client, "/api/v1/integrations/arcgis/push", ARCGIS_BYTES)
         # This might return 200 or 404 depending on configuration
         assert response.status_code in [200, 404, 500]
     
-    def test_error_handling(self):
+    @pytest.mark.parametrize(
+        "method,url,body,expected",
+        [
+            # Invalid telemetry data: missing required fields
+            ("post", "/api/v1/telemetry/", {"device_id": "test_device"}, 422),
+            # Non-existent device
+            ("get", "/api/v1/telemetry/devices/nonexistent/latest", None, 404),
+            # Invalid triangulation data: empty observations
+            ("post", "/api/v1/triangulation/triangulate", {"observations": []}, 422),
+        ],
+        ids=["invalid_telemetry", "unknown_device", "empty_observations"]
+    )
+    async def test_error_handling(self, client, method, url, body, expected):
         """Test error handling."""
-        # Test invalid telemetry data
-        invalid_telemetry = {
-            "device_id": "test_device",
-            # Missing required fields
-        }
+        if body is None:
+            response = await getattr(client, method)(url)
+        else:
+            response = await post_json(client, url, body)
         
-        response = self.client.post("/api/v1/telemetry/", json=invalid_telemetry)
-        assert response.status_code == 422  # Validation error
-        
-        # Test non-existent device
-        response = self.client.get("/api/v1/telemetry/devices/nonexistent/latest")
-        assert response.status_code == 404
-        
-        # Test invalid triangulation data
-        invalid_triangulation = {
-            "observations": []  # Empty observations
-        }
-        
-        response = self.client.post("/api/v1/triangulation/triangulate", json=invalid_triangulation)
-        assert response.status_code == 422  # Validation error
+        assert response.status_code == expected
     
-    def test_cors_headers(self):
+    async def test_cors_headers(self, client, cors_enabled):
         """Test CORS headers."""
-        response = self.client.options("/api/v1/telemetry/")
+        if not cors_enabled:
+            pytest.skip("CORS not configured")
+        
+        response = await client.options("/api/v1/telemetry/")
         assert response.status_code == 200
         assert "access-control-allow-origin" in response.headers
     
-    def test_rate_limiting(self):
+    async def test_rate_limiting(self, client):
         """Test rate limiting (if implemented)."""
-        # Make multiple requests quickly
-        for _ in range(10):
-            response = self.client.get("/api/v1/telemetry/")
-            # Should not be rate limited for this test
-            assert response.status_code in [200, 429]
+        # Make multiple requests concurrently
+        responses = await asyncio.gather(*(client.get("/api/v1/telemetry/") for _ in range(10)))
+        
+        # Should not be rate limited for this test
+        assert {response.status_code for response in responses} <= {200, 429}
     
-    def test_pagination(self):
+    async def test_pagination(self, client, seeded_telemetry):
         """Test pagination for list endpoints."""
-        # Create multiple telemetry records
-        for i in range(5):
-            telemetry_data = {
-                "device_id": f"test_device_{i:03d}",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "latitude": 40.0 + i * 0.01,
-                "longitude": -120.0 + i * 0.01,
-                "altitude": 1000.0,
-                "yaw": 0.0,
-                "pitch": 0.0,
-                "roll": 0.0,
-                "speed": 5.0,
-                "battery_level": 85.0,
-                "sensors": [],
-                "status": "online"
-            }
-            
-            response = self.client.post("/api/v1/telemetry/", json=telemetry_data)
-            assert response.status_code == 200
-        
         # Test pagination
-        response = self.client.get("/api/v1/telemetry/?limit=3")
+        response = await client.get("/api/v1/telemetry/?limit=3")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert len(data) <= 3
         
         # Test offset
-        response = self.client.get("/api/v1/telemetry/?limit=3&offset=2")
+        response = await client.get("/api/v1/telemetry/?limit=3&offset=2")
         assert response.status_code == 200
         
-        data = response.json()
+        data = orjson.loads(response.content)
         assert len(data) <= 3
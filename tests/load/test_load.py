@@ -3,520 +3,459 @@ Load tests for the wildfire operations platform.
 """
 
 import asyncio
+import os
 import aiohttp
+import numpy as np
+import orjson
 import time
-import statistics
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
+from yarl import URL
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the summary then runs as plain NumPy
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+
+# Monotonic, high-resolution clock for latency measurement
+_now = time.perf_counter
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# The few distinct id strings, built once and shared by every payload
+_DEVICE_IDS = tuple(f"load_test_device_{i}" for i in range(10))
+_CAMERA_IDS = tuple(f"camera_{i}" for i in range(3))
+_CAM_IDS = tuple(f"cam_{i}" for i in range(5))
+_MEDIA_PREFIXES = tuple(f"video_{i}_frame_" for i in range(10))
+
+# Fields that do not vary between requests; copied, then filled per request
+_TELEMETRY_BASE = {
+    "timestamp": "2024-01-01T00:00:00Z",
+    "altitude": 1000.0,
+    "pitch": 0.0,
+    "roll": 0.0,
+    "status": "online"
+}
+
+_DETECTION_BASE = {
+    "timestamp": "2024-01-01T00:00:00Z",
+    "source": "edge"
+}
+
+# (endpoint_type, method, path, payload); payload is None for GETs
+_Request = Tuple[int, str, str, Optional[Dict[str, Any]]]
+
+# (endpoint_type, method, url, body, headers) ready to send
+_PreparedRequest = Tuple[int, str, URL, Optional[bytes], Optional[Dict[str, str]]]
+
+# One row per request; status_code 0 marks a connection error
+_RESULT_DTYPE = np.dtype([
+    ("response_time", np.float64),
+    ("status_code", np.int32),
+    ("success", np.bool_),
+    ("endpoint_type", np.int8)
+])
+
+
+@njit(cache=True)
+def _summary(arr):
+    """Mean, median, min, max, p95 and p99 of ``arr``, which is sorted in place.
+    
+    Percentiles use the same nearest-rank index as ``LoadTester.percentile``.
+    """
+    arr.sort()
+    n = arr.shape[0]
+    median = 0.5 * (arr[(n - 1) // 2] + arr[n // 2])
+    p95 = arr[min(int(n * 0.95), n - 1)]
+    p99 = arr[min(int(n * 0.99), n - 1)]
+    return arr.mean(), median, arr[0], arr[n - 1], p95, p99
+
+
+def _telemetry_payload(request_id: int) -> Dict[str, Any]:
+    """Telemetry record for one load-test request."""
+    telemetry_data = _TELEMETRY_BASE.copy()
+    telemetry_data.update(
+        device_id=_DEVICE_IDS[request_id % 10],
+        latitude=40.0 + (request_id % 100) * 0.001,
+        longitude=-120.0 + (request_id % 100) * 0.001,
+        yaw=request_id % 360,
+        speed=5.0 + (request_id % 10),
+        battery_level=85.0 - (request_id % 20),
+        sensors=[
+            {
+                "name": "temperature",
+                "unit": "celsius",
+                "value": 25.0 + (request_id % 10),
+                "timestamp": "2024-01-01T00:00:00Z"
+            }
+        ],
+        comms_rssi=-65.0 - (request_id % 20),
+        temperature=25.0 + (request_id % 10)
+    )
+    return telemetry_data
+
+
+def _detection_payload(request_id: int) -> Dict[str, Any]:
+    """Detection record for one load-test request."""
+    detection_data = _DETECTION_BASE.copy()
+    detection_data.update(
+        device_id=_DEVICE_IDS[request_id % 10],
+        type="smoke" if request_id % 2 == 0 else "flame",
+        latitude=40.0 + (request_id % 100) * 0.001,
+        longitude=-120.0 + (request_id % 100) * 0.001,
+        bearing=request_id % 360,
+        confidence=0.5 + (request_id % 50) / 100,
+        media_ref=_MEDIA_PREFIXES[request_id % 10] + str(request_id),
+        metadata={
+            "camera_id": _CAM_IDS[request_id % 5],
+            "frame_number": request_id
+        }
+    )
+    return detection_data
+
+
+def _triangulation_payload(request_id: int) -> Dict[str, Any]:
+    """Two-camera triangulation request for one load-test request."""
+    return {
+        "observations": [
+            {
+                "device_id": _CAMERA_IDS[request_id % 3],
+                "timestamp": "2024-01-01T00:00:00Z",
+                "device_latitude": 40.0 + (request_id % 10) * 0.01,
+                "device_longitude": -120.0 + (request_id % 10) * 0.01,
+                "device_altitude": 1000.0,
+                "camera_heading": request_id % 360,
+                "camera_pitch": 0.0,
+                "bearing": 45.0 + (request_id % 90),
+                "confidence": 0.7 + (request_id % 30) / 100,
+                "detection_id": f"det_{request_id}"
+            },
+            {
+                "device_id": _CAMERA_IDS[(request_id + 1) % 3],
+                "timestamp": "2024-01-01T00:00:00Z",
+                "device_latitude": 40.1 + (request_id % 10) * 0.01,
+                "device_longitude": -119.9 + (request_id % 10) * 0.01,
+                "device_altitude": 1100.0,
+                "camera_heading": (request_id + 90) % 360,
+                "camera_pitch": 0.0,
+                "bearing": 315.0 + (request_id % 90),
+                "confidence": 0.8 + (request_id % 20) / 100,
+                "detection_id": f"det_{request_id + 1}"
+            }
+        ],
+        "max_distance_km": 50.0,
+        "min_confidence": 0.7
+    }
+
+
+def _post(path: str, payload_fn: Callable[[int], Dict[str, Any]]) -> Callable[[int], _Request]:
+    """Request builder that POSTs ``payload_fn(request_id)`` to ``path``."""
+    def build(request_id: int) -> _Request:
+        return 0, "POST", path, payload_fn(request_id)
+    return build
+
+
+_MIXED_ENDPOINT_NAMES = ["Telemetry POST", "Detections POST", "Telemetry GET", "Detections GET"]
+
+
+def _mixed_request(request_id: int) -> _Request:
+    """Spread requests round-robin over telemetry/detection writes and reads."""
+    endpoint_type = request_id % 4
+    
+    if endpoint_type == 0:  # Telemetry
+        data = _TELEMETRY_BASE.copy()
+        data.update(
+            device_id=_DEVICE_IDS[request_id % 10],
+            latitude=40.0 + (request_id % 100) * 0.001,
+            longitude=-120.0 + (request_id % 100) * 0.001,
+            yaw=request_id % 360,
+            speed=5.0 + (request_id % 10),
+            battery_level=85.0 - (request_id % 20),
+            sensors=[]
+        )
+        return endpoint_type, "POST", "/api/v1/telemetry/", data
+    
+    if endpoint_type == 1:  # Detections
+        data = _DETECTION_BASE.copy()
+        data.update(
+            device_id=_DEVICE_IDS[request_id % 10],
+            type="smoke" if request_id % 2 == 0 else "flame",
+            latitude=40.0 + (request_id % 100) * 0.001,
+            longitude=-120.0 + (request_id % 100) * 0.001,
+            bearing=request_id % 360,
+            confidence=0.5 + (request_id % 50) / 100,
+            media_ref=_MEDIA_PREFIXES[request_id % 10] + str(request_id),
+            metadata={}
+        )
+        return endpoint_type, "POST", "/api/v1/detections/", data
+    
+    if endpoint_type == 2:  # Get telemetry
+        return endpoint_type, "GET", "/api/v1/telemetry/?limit=10", None
+    
+    # Get detections
+    return endpoint_type, "GET", "/api/v1/detections/?limit=10", None
+
+
+async def _make_request(
+    session: aiohttp.ClientSession, results: np.ndarray, request_id: int, request: _PreparedRequest
+):
+    """Send and time a single prepared request into ``results[request_id]``."""
+    endpoint_type, method, url, payload, headers = request
+    status_code = 0
+    
+    start_time = _now()
+    try:
+        async with session.request(method, url, data=payload, headers=headers) as response:
+            response_time = _now() - start_time
+            status_code = response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+        # Connection errors are recorded as status 0; anything else is a bug and propagates
+        response_time = _now() - start_time
+    
+    results[request_id] = (response_time, status_code, status_code == 200, endpoint_type)
+
+
+async def _worker(session: aiohttp.ClientSession, pending: Iterator[Tuple[int, _PreparedRequest]], results: np.ndarray):
+    """Drain ``pending`` one request at a time.
+    
+    Kept at module level with explicit arguments so the hot loop reads only
+    locals rather than closure cells and instance attributes.
+    """
+    for request_id, request in pending:
+        await _make_request(session, results, request_id, request)
 
 
 class LoadTester:
     """Load testing utility for the wildfire operations platform."""
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", max_concurrency: int = 20):
         self.base_url = base_url
+        self.max_concurrency = max_concurrency
         self.results: List[Dict[str, Any]] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._urls: Dict[str, URL] = {}
+    
+    async def __aenter__(self):
+        """Open one keep-alive session shared by every test, unless one is already open."""
+        if self._session is None:
+            self._open_session(self.max_concurrency * 2)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._close_session()
+    
+    def _open_session(self, connection_limit: int):
+        """Open the shared session with room for ``connection_limit`` requests in flight."""
+        connector = aiohttp.TCPConnector(
+            limit=connection_limit,
+            limit_per_host=connection_limit,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+    
+    async def _close_session(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
     
     async def test_telemetry_endpoint(self, num_requests: int = 100, concurrency: int = 10):
         """Test telemetry endpoint under load."""
         print(f"Testing telemetry endpoint with {num_requests} requests, concurrency {concurrency}")
-        
-        async def make_request(session: aiohttp.ClientSession, request_id: int):
-            """Make a single telemetry request."""
-            telemetry_data = {
-                "device_id": f"load_test_device_{request_id % 10}",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "latitude": 40.0 + (request_id % 100) * 0.001,
-                "longitude": -120.0 + (request_id % 100) * 0.001,
-                "altitude": 1000.0,
-                "yaw": request_id % 360,
-                "pitch": 0.0,
-                "roll": 0.0,
-                "speed": 5.0 + (request_id % 10),
-                "battery_level": 85.0 - (request_id % 20),
-                "sensors": [
-                    {
-                        "name": "temperature",
-                        "unit": "celsius",
-                        "value": 25.0 + (request_id % 10),
-                        "timestamp": "2024-01-01T00:00:00Z"
-                    }
-                ],
-                "status": "online",
-                "comms_rssi": -65.0 - (request_id % 20),
-                "temperature": 25.0 + (request_id % 10)
-            }
-            
-            start_time = time.time()
-            try:
-                async with session.post(f"{self.base_url}/api/v1/telemetry/", json=telemetry_data) as response:
-                    end_time = time.time()
-                    response_time = end_time - start_time
-                    
-                    return {
-                        "request_id": request_id,
-                        "status_code": response.status,
-                        "response_time": response_time,
-                        "success": response.status == 200
-                    }
-            except Exception as e:
-                end_time = time.time()
-                response_time = end_time - start_time
-                return {
-                    "request_id": request_id,
-                    "status_code": 0,
-                    "response_time": response_time,
-                    "success": False,
-                    "error": str(e)
-                }
-        
-        # Run load test
-        start_time = time.time()
-        
-        async with aiohttp.ClientSession() as session:
-            semaphore = asyncio.Semaphore(concurrency)
-            
-            async def bounded_request(request_id):
-                async with semaphore:
-                    return await make_request(session, request_id)
-            
-            tasks = [bounded_request(i) for i in range(num_requests)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        end_time = time.time()
-        total_time = end_time - start_time
-        
-        # Process results
-        successful_requests = [r for r in results if isinstance(r, dict) and r.get("success", False)]
-        failed_requests = [r for r in results if isinstance(r, dict) and not r.get("success", False)]
-        
-        response_times = [r["response_time"] for r in successful_requests]
-        
-        print(f"Telemetry Load Test Results:")
-        print(f"  Total requests: {num_requests}")
-        print(f"  Successful: {len(successful_requests)}")
-        print(f"  Failed: {len(failed_requests)}")
-        print(f"  Success rate: {len(successful_requests) / num_requests * 100:.2f}%")
-        print(f"  Total time: {total_time:.2f}s")
-        print(f"  Requests per second: {num_requests / total_time:.2f}")
-        
-        if response_times:
-            print(f"  Average response time: {statistics.mean(response_times):.3f}s")
-            print(f"  Median response time: {statistics.median(response_times):.3f}s")
-            print(f"  Min response time: {min(response_times):.3f}s")
-            print(f"  Max response time: {max(response_times):.3f}s")
-            print(f"  95th percentile: {self.percentile(response_times, 95):.3f}s")
-            print(f"  99th percentile: {self.percentile(response_times, 99):.3f}s")
-        
-        return {
-            "endpoint": "telemetry",
-            "total_requests": num_requests,
-            "successful_requests": len(successful_requests),
-            "failed_requests": len(failed_requests),
-            "success_rate": len(successful_requests) / num_requests,
-            "total_time": total_time,
-            "requests_per_second": num_requests / total_time,
-            "response_times": response_times
-        }
+        return await self._run_scenario(
+            "telemetry", _post("/api/v1/telemetry/", _telemetry_payload), num_requests, concurrency
+        )
     
     async def test_detections_endpoint(self, num_requests: int = 100, concurrency: int = 10):
         """Test detections endpoint under load."""
         print(f"Testing detections endpoint with {num_requests} requests, concurrency {concurrency}")
-        
-        async def make_request(session: aiohttp.ClientSession, request_id: int):
-            """Make a single detection request."""
-            detection_data = {
-                "device_id": f"load_test_device_{request_id % 10}",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "type": "smoke" if request_id % 2 == 0 else "flame",
-                "latitude": 40.0 + (request_id % 100) * 0.001,
-                "longitude": -120.0 + (request_id % 100) * 0.001,
-                "bearing": request_id % 360,
-                "confidence": 0.5 + (request_id % 50) / 100,
-                "media_ref": f"video_{request_id % 10}_frame_{request_id}",
-                "source": "edge",
-                "metadata": {
-                    "camera_id": f"cam_{request_id % 5}",
-                    "frame_number": request_id
-                }
-            }
-            
-            start_time = time.time()
-            try:
-                async with session.post(f"{self.base_url}/api/v1/detections/", json=detection_data) as response:
-                    end_time = time.time()
-                    response_time = end_time - start_time
-                    
-                    return {
-                        "request_id": request_id,
-                        "status_code": response.status,
-                        "response_time": response_time,
-                        "success": response.status == 200
-                    }
-            except Exception as e:
-                end_time = time.time()
-                response_time = end_time - start_time
-                return {
-                    "request_id": request_id,
-                    "status_code": 0,
-                    "response_time": response_time,
-                    "success": False,
-                    "error": str(e)
-                }
-        
-        # Run load test
-        start_time = time.time()
-        
-        async with aiohttp.ClientSession() as session:
-            semaphore = asyncio.Semaphore(concurrency)
-            
-            async def bounded_request(request_id):
-                async with semaphore:
-                    return await make_request(session, request_id)
-            
-            tasks = [bounded_request(i) for i in range(num_requests)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        end_time = time.time()
-        total_time = end_time - start_time
-        
-        # Process results
-        successful_requests = [r for r in results if isinstance(r, dict) and r.get("success", False)]
-        failed_requests = [r for r in results if isinstance(r, dict) and not r.get("success", False)]
-        
-        response_times = [r["response_time"] for r in successful_requests]
-        
-        print(f"Detections Load Test Results:")
-        print(f"  Total requests: {num_requests}")
-        print(f"  Successful: {len(successful_requests)}")
-        print(f"  Failed: {len(failed_requests)}")
-        print(f"  Success rate: {len(successful_requests) / num_requests * 100:.2f}%")
-        print(f"  Total time: {total_time:.2f}s")
-        print(f"  Requests per second: {num_requests / total_time:.2f}")
-        
-        if response_times:
-            print(f"  Average response time: {statistics.mean(response_times):.3f}s")
-            print(f"  Median response time: {statistics.median(response_times):.3f}s")
-            print(f"  Min response time: {min(response_times):.3f}s")
-            print(f"  Max response time: {max(response_times):.3f}s")
-            print(f"  95th percentile: {self.percentile(response_times, 95):.3f}s")
-            print(f"  99th percentile: {self.percentile(response_times, 99):.3f}s")
-        
-        return {
-            "endpoint": "detections",
-            "total_requests": num_requests,
-            "successful_requests": len(successful_requests),
-            "failed_requests": len(failed_requests),
-            "success_rate": len(successful_requests) / num_requests,
-            "total_time": total_time,
-            "requests_per_second": num_requests / total_time,
-            "response_times": response_times
-        }
+        return await self._run_scenario(
+            "detections", _post("/api/v1/detections/", _detection_payload), num_requests, concurrency
+        )
     
     async def test_triangulation_endpoint(self, num_requests: int = 50, concurrency: int = 5):
         """Test triangulation endpoint under load."""
         print(f"Testing triangulation endpoint with {num_requests} requests, concurrency {concurrency}")
-        
-        async def make_request(session: aiohttp.ClientSession, request_id: int):
-            """Make a single triangulation request."""
-            triangulation_data = {
-                "observations": [
-                    {
-                        "device_id": f"camera_{request_id % 3}",
-                        "timestamp": "2024-01-01T00:00:00Z",
-                        "device_latitude": 40.0 + (request_id % 10) * 0.01,
-                        "device_longitude": -120.0 + (request_id % 10) * 0.01,
-                        "device_altitude": 1000.0,
-                        "camera_heading": request_id % 360,
-                        "camera_pitch": 0.0,
-                        "bearing": 45.0 + (request_id % 90),
-                        "confidence": 0.7 + (request_id % 30) / 100,
-                        "detection_id": f"det_{request_id}"
-                    },
-                    {
-                        "device_id": f"camera_{(request_id + 1) % 3}",
-                        "timestamp": "2024-01-01T00:00:00Z",
-                        "device_latitude": 40.1 + (request_id % 10) * 0.01,
-                        "device_longitude": -119.9 + (request_id % 10) * 0.01,
-                        "device_altitude": 1100.0,
-                        "camera_heading": (request_id + 90) % 360,
-                        "camera_pitch": 0.0,
-                        "bearing": 315.0 + (request_id % 90),
-                        "confidence": 0.8 + (request_id % 20) / 100,
-                        "detection_id": f"det_{request_id + 1}"
-                    }
-                ],
-                "max_distance_km": 50.0,
-                "min_confidence": 0.7
-            }
-            
-            start_time = time.time()
+        return await self._run_scenario(
+            "triangulation",
+            _post("/api/v1/triangulation/triangulate", _triangulation_payload),
+            num_requests,
+            concurrency
+        )
+    
+    async def test_mixed_load(self, num_requests: int = 200, concurrency: int = 20):
+        """Test mixed load across multiple endpoints."""
+        print(f"Testing mixed load with {num_requests} requests, concurrency {concurrency}")
+        return await self._run_scenario(
+            "mixed", _mixed_request, num_requests, concurrency, endpoint_names=_MIXED_ENDPOINT_NAMES
+        )
+    
+    def _url(self, path: str) -> URL:
+        """Absolute URL for ``path``; parsed once, so aiohttp can skip re-parsing it."""
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = URL(f"{self.base_url}{path}")
+        return url
+    
+    def _prepare_request(self, build_request: Callable[[int], _Request], request_id: int) -> _PreparedRequest:
+        """Resolve the URL and encode the body for one request."""
+        endpoint_type, method, path, data = build_request(request_id)
+        if data is None:
+            return endpoint_type, method, self._url(path), None, None
+        return endpoint_type, method, self._url(path), orjson.dumps(data), _JSON_HEADERS
+    
+    async def _run_workers(self, requests: List[_PreparedRequest], concurrency: int) -> np.ndarray:
+        """Issue every request through a fixed pool of ``concurrency`` workers.
+        
+        Workers pull requests from one shared iterator, so only
+        ``concurrency`` requests are ever in flight at a time. Each worker
+        writes its outcome straight into the request's row of the result array.
+        """
+        pending = iter(enumerate(requests))
+        results = np.zeros(len(requests), dtype=_RESULT_DTYPE)
+        
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(concurrency):
+                tg.create_task(_worker(self._session, pending, results))
+        return results
+    
+    async def _run_scenario(
+        self,
+        name: str,
+        build_request: Callable[[int], _Request],
+        num_requests: int,
+        concurrency: int,
+        endpoint_names: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Run one load scenario and report its results.
+        
+        ``build_request`` maps a request id to ``(endpoint_type, method, path,
+        payload)``. When ``endpoint_names`` is given, results are also broken
+        down per endpoint type.
+        """
+        if self._session is None:
+            # Called outside ``async with``: open a session for this scenario only
+            self._open_session(concurrency)
             try:
-                async with session.post(f"{self.base_url}/api/v1/triangulation/triangulate", json=triangulation_data) as response:
-                    end_time = time.time()
-                    response_time = end_time - start_time
-                    
-                    return {
-                        "request_id": request_id,
-                        "status_code": response.status,
-                        "response_time": response_time,
-                        "success": response.status == 200
-                    }
-            except Exception as e:
-                end_time = time.time()
-                response_time = end_time - start_time
-                return {
-                    "request_id": request_id,
-                    "status_code": 0,
-                    "response_time": response_time,
-                    "success": False,
-                    "error": str(e)
-                }
+                return await self._run_scenario(name, build_request, num_requests, concurrency, endpoint_names)
+            finally:
+                await self._close_session()
+        
+        # Encode every request up front so serialization stays out of the timed loop
+        requests = [self._prepare_request(build_request, request_id) for request_id in range(num_requests)]
         
         # Run load test
-        start_time = time.time()
+        start_time = _now()
         
-        async with aiohttp.ClientSession() as session:
-            semaphore = asyncio.Semaphore(concurrency)
-            
-            async def bounded_request(request_id):
-                async with semaphore:
-                    return await make_request(session, request_id)
-            
-            tasks = [bounded_request(i) for i in range(num_requests)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await self._run_workers(requests, concurrency)
         
-        end_time = time.time()
+        end_time = _now()
         total_time = end_time - start_time
         
         # Process results
-        successful_requests = [r for r in results if isinstance(r, dict) and r.get("success", False)]
-        failed_requests = [r for r in results if isinstance(r, dict) and not r.get("success", False)]
+        success = results["success"]
+        successful_requests = int(np.count_nonzero(success))
+        failed_requests = num_requests - successful_requests
         
-        response_times = [r["response_time"] for r in successful_requests]
+        response_times = results["response_time"][success]
         
-        print(f"Triangulation Load Test Results:")
+        print(f"{name.capitalize()} Load Test Results:")
         print(f"  Total requests: {num_requests}")
-        print(f"  Successful: {len(successful_requests)}")
-        print(f"  Failed: {len(failed_requests)}")
-        print(f"  Success rate: {len(successful_requests) / num_requests * 100:.2f}%")
+        print(f"  Successful: {successful_requests}")
+        print(f"  Failed: {failed_requests}")
+        print(f"  Success rate: {successful_requests / num_requests * 100:.2f}%")
         print(f"  Total time: {total_time:.2f}s")
         print(f"  Requests per second: {num_requests / total_time:.2f}")
         
-        if response_times:
-            print(f"  Average response time: {statistics.mean(response_times):.3f}s")
-            print(f"  Median response time: {statistics.median(response_times):.3f}s")
-            print(f"  Min response time: {min(response_times):.3f}s")
-            print(f"  Max response time: {max(response_times):.3f}s")
-            print(f"  95th percentile: {self.percentile(response_times, 95):.3f}s")
-            print(f"  99th percentile: {self.percentile(response_times, 99):.3f}s")
-        
-        return {
-            "endpoint": "triangulation",
+        if response_times.size:
+            mean, median, low, high, p95, p99 = _summary(response_times)
+            print(f"  Average response time: {mean:.3f}s")
+            print(f"  Median response time: {median:.3f}s")
+            print(f"  Min response time: {low:.3f}s")
+            print(f"  Max response time: {high:.3f}s")
+            print(f"  95th percentile: {p95:.3f}s")
+            print(f"  99th percentile: {p99:.3f}s")
+        
+        summary = {
+            "endpoint": name,
             "total_requests": num_requests,
-            "successful_requests": len(successful_requests),
-            "failed_requests": len(failed_requests),
-            "success_rate": len(successful_requests) / num_requests,
+            "successful_requests": successful_requests,
+            "failed_requests": failed_requests,
+            "success_rate": successful_requests / num_requests,
             "total_time": total_time,
             "requests_per_second": num_requests / total_time,
             "response_times": response_times
         }
-    
-    async def test_mixed_load(self, num_requests: int = 200, concurrency: int = 20):
-        """Test mixed load across multiple endpoints."""
-        print(f"Testing mixed load with {num_requests} requests, concurrency {concurrency}")
-        
-        async def make_mixed_request(session: aiohttp.ClientSession, request_id: int):
-            """Make a request to different endpoints based on request_id."""
-            endpoint_type = request_id % 4
-            
-            if endpoint_type == 0:  # Telemetry
-                data = {
-                    "device_id": f"load_test_device_{request_id % 10}",
-                    "timestamp": "2024-01-01T00:00:00Z",
-                    "latitude": 40.0 + (request_id % 100) * 0.001,
-                    "longitude": -120.0 + (request_id % 100) * 0.001,
-                    "altitude": 1000.0,
-                    "yaw": request_id % 360,
-                    "pitch": 0.0,
-                    "roll": 0.0,
-                    "speed": 5.0 + (request_id % 10),
-                    "battery_level": 85.0 - (request_id % 20),
-                    "sensors": [],
-                    "status": "online"
-                }
-                url = f"{self.base_url}/api/v1/telemetry/"
-                method = "POST"
-                
-            elif endpoint_type == 1:  # Detections
-                data = {
-                    "device_id": f"load_test_device_{request_id % 10}",
-                    "timestamp": "2024-01-01T00:00:00Z",
-                    "type": "smoke" if request_id % 2 == 0 else "flame",
-                    "latitude": 40.0 + (request_id % 100) * 0.001,
-                    "longitude": -120.0 + (request_id % 100) * 0.001,
-                    "bearing": request_id % 360,
-                    "confidence": 0.5 + (request_id % 50) / 100,
-                    "media_ref": f"video_{request_id % 10}_frame_{request_id}",
-                    "source": "edge",
-                    "metadata": {}
-                }
-                url = f"{self.base_url}/api/v1/detections/"
-                method = "POST"
-                
-            elif endpoint_type == 2:  # Get telemetry
-                data = None
-                url = f"{self.base_url}/api/v1/telemetry/?limit=10"
-                method = "GET"
-                
-            else:  # Get detections
-                data = None
-                url = f"{self.base_url}/api/v1/detections/?limit=10"
-                method = "GET"
-            
-            start_time = time.time()
-            try:
-                if method == "POST":
-                    async with session.post(url, json=data) as response:
-                        end_time = time.time()
-                        response_time = end_time - start_time
-                        
-                        return {
-                            "request_id": request_id,
-                            "endpoint_type": endpoint_type,
-                            "status_code": response.status,
-                            "response_time": response_time,
-                            "success": response.status == 200
-                        }
-                else:
-                    async with session.get(url) as response:
-                        end_time = time.time()
-                        response_time = end_time - start_time
-                        
-                        return {
-                            "request_id": request_id,
-                            "endpoint_type": endpoint_type,
-                            "status_code": response.status,
-                            "response_time": response_time,
-                            "success": response.status == 200
-                        }
-            except Exception as e:
-                end_time = time.time()
-                response_time = end_time - start_time
-                return {
-                    "request_id": request_id,
-                    "endpoint_type": endpoint_type,
-                    "status_code": 0,
-                    "response_time": response_time,
-                    "success": False,
-                    "error": str(e)
-                }
-        
-        # Run load test
-        start_time = time.time()
-        
-        async with aiohttp.ClientSession() as session:
-            semaphore = asyncio.Semaphore(concurrency)
-            
-            async def bounded_request(request_id):
-                async with semaphore:
-                    return await make_mixed_request(session, request_id)
-            
-            tasks = [bounded_request(i) for i in range(num_requests)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        end_time = time.time()
-        total_time = end_time - start_time
-        
-        # Process results
-        successful_requests = [r for r in results if isinstance(r, dict) and r.get("success", False)]
-        failed_requests = [r for r in results if isinstance(r, dict) and not r.get("success", False)]
         
-        response_times = [r["response_time"] for r in successful_requests]
+        if endpoint_names is None:
+            return summary
         
         # Group by endpoint type
         endpoint_stats = {}
-        for result in results:
-            if isinstance(result, dict) and "endpoint_type" in result:
-                endpoint_type = result["endpoint_type"]
-                if endpoint_type not in endpoint_stats:
-                    endpoint_stats[endpoint_type] = {"successful": 0, "failed": 0, "response_times": []}
-                
-                if result.get("success", False):
-                    endpoint_stats[endpoint_type]["successful"] += 1
-                else:
-                    endpoint_stats[endpoint_type]["failed"] += 1
-                
-                endpoint_stats[endpoint_type]["response_times"].append(result["response_time"])
-        
-        print(f"Mixed Load Test Results:")
-        print(f"  Total requests: {num_requests}")
-        print(f"  Successful: {len(successful_requests)}")
-        print(f"  Failed: {len(failed_requests)}")
-        print(f"  Success rate: {len(successful_requests) / num_requests * 100:.2f}%")
-        print(f"  Total time: {total_time:.2f}s")
-        print(f"  Requests per second: {num_requests / total_time:.2f}")
-        
-        if response_times:
-            print(f"  Average response time: {statistics.mean(response_times):.3f}s")
-            print(f"  Median response time: {statistics.median(response_times):.3f}s")
-            print(f"  Min response time: {min(response_times):.3f}s")
-            print(f"  Max response time: {max(response_times):.3f}s")
-            print(f"  95th percentile: {self.percentile(response_times, 95):.3f}s")
-            print(f"  99th percentile: {self.percentile(response_times, 99):.3f}s")
+        for endpoint_type in np.unique(results["endpoint_type"]).tolist():
+            mask = results["endpoint_type"] == endpoint_type
+            successful = int(np.count_nonzero(success & mask))
+            endpoint_stats[endpoint_type] = {
+                "successful": successful,
+                "failed": int(np.count_nonzero(mask)) - successful,
+                "response_times": results["response_time"][mask]
+            }
         
         print(f"\nEndpoint-specific results:")
-        endpoint_names = ["Telemetry POST", "Detections POST", "Telemetry GET", "Detections GET"]
         for endpoint_type, stats in endpoint_stats.items():
             total = stats["successful"] + stats["failed"]
             success_rate = stats["successful"] / total if total > 0 else 0
-            avg_response_time = statistics.mean(stats["response_times"]) if stats["response_times"] else 0
+            avg_response_time = stats["response_times"].mean() if total > 0 else 0
             
             print(f"  {endpoint_names[endpoint_type]}:")
             print(f"    Total: {total}")
             print(f"    Success rate: {success_rate * 100:.2f}%")
             print(f"    Average response time: {avg_response_time:.3f}s")
         
-        return {
-            "endpoint": "mixed",
-            "total_requests": num_requests,
-            "successful_requests": len(successful_requests),
-            "failed_requests": len(failed_requests),
-            "success_rate": len(successful_requests) / num_requests,
-            "total_time": total_time,
-            "requests_per_second": num_requests / total_time,
-            "response_times": response_times,
-            "endpoint_stats": endpoint_stats
-        }
+        summary["endpoint_stats"] = endpoint_stats
+        return summary
     
-    def percentile(self, data: List[float], percentile: float) -> float:
-        """Calculate percentile of data."""
-        if not data:
+    def percentile(self, data, percentile: float) -> float:
+        """Calculate percentile of data (a sequence or float64 array)."""
+        values = np.asarray(data, dtype=np.float64)
+        if not values.size:
             return 0.0
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
+        index = min(int(values.size * percentile / 100), values.size - 1)
+        return float(np.partition(values, index)[index])
     
-    async def run_all_tests(self):
-        """Run all load tests."""
+    async def run_all_tests(self, parallel: bool = False):
+        """Run all load tests.
+        
+        With ``parallel`` the four scenarios share the server at once, which
+        measures combined load; per-endpoint figures then include contention.
+        """
         print("Starting comprehensive load testing...")
         print("=" * 50)
         
         results = []
-        
-        # Test individual endpoints
-        results.append(await self.test_telemetry_endpoint(100, 10))
-        print()
-        
-        results.append(await self.test_detections_endpoint(100, 10))
-        print()
-        
-        results.append(await self.test_triangulation_endpoint(50, 5))
-        print()
-        
-        # Test mixed load
-        results.append(await self.test_mixed_load(200, 20))
-        print()
+        scenarios = [
+            (self.test_telemetry_endpoint, 100, 10),
+            (self.test_detections_endpoint, 100, 10),
+            (self.test_triangulation_endpoint, 50, 5),
+            (self.test_mixed_load, 200, 20),
+        ]
+        
+        if parallel and self._session is None:
+            # Every scenario's workers are in flight at once; size the pool for
+            # all of them so no request waits for a connection while timed
+            self._open_session(sum(concurrency for _, _, concurrency in scenarios))
+        
+        async with self:
+            if parallel:
+                results.extend(await asyncio.gather(
+                    *(test(num_requests, concurrency) for test, num_requests, concurrency in scenarios)
+                ))
+                print()
+            else:
+                for test, num_requests, concurrency in scenarios:
+                    results.append(await test(num_requests, concurrency))
+                    print()
         
         # Summary
         print("=" * 50)
@@ -533,15 +472,14 @@ class LoadTester:
         print(f"Total failed: {total_failed}")
         print(f"Overall success rate: {overall_success_rate * 100:.2f}%")
         
-        all_response_times = []
-        for result in results:
-            all_response_times.extend(result["response_times"])
+        all_response_times = np.concatenate([result["response_times"] for result in results])
         
-        if all_response_times:
-            print(f"Overall average response time: {statistics.mean(all_response_times):.3f}s")
-            print(f"Overall median response time: {statistics.median(all_response_times):.3f}s")
-            print(f"Overall 95th percentile: {self.percentile(all_response_times, 95):.3f}s")
-            print(f"Overall 99th percentile: {self.percentile(all_response_times, 99):.3f}s")
+        if all_response_times.size:
+            mean, median, _, _, p95, p99 = _summary(all_response_times)
+            print(f"Overall average response time: {mean:.3f}s")
+            print(f"Overall median response time: {median:.3f}s")
+            print(f"Overall 95th percentile: {p95:.3f}s")
+            print(f"Overall 99th percentile: {p99:.3f}s")
         
         return results
 
@@ -549,8 +487,27 @@ class LoadTester:
 async def main():
     """Main function to run load tests."""
     tester = LoadTester()
-    await tester.run_all_tests()
+    await tester.run_all_tests(parallel=os.getenv("SENTINEL_LOAD_PARALLEL") == "1")
+
+
+def _loop_factory():
+    """Pick the event loop for the load generator from SENTINEL_LOOP.
+
+    ``uvloop`` (the default) falls back to the stock loop when uvloop is not
+    installed; ``default`` always uses the stock loop for comparison runs.
+    """
+    choice = os.getenv("SENTINEL_LOOP", "uvloop")
+    if choice == "uvloop":
+        try:
+            import uvloop
+            return uvloop.new_event_loop
+        except ImportError:
+            print("uvloop not installed, using the default event loop")
+    elif choice != "default":
+        raise ValueError(f"Unknown SENTINEL_LOOP: {choice}")
+    return None
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+        runner.run(main())
@@ -0,0 +1,71 @@
+"""
+Shared fixtures for the algorithm unit tests.
+
+Compute-heavy tests are marked ``slow``; skip them with ``-m "not slow"``.
+The tests are independent, so ``pytest -n auto`` (pytest-xdist) spreads them
+over all cores.
+"""
+
+import numpy as np
+import pytest
+
+from packages.algorithms.src.fusion import EnvironmentalData
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: model training or repeated Monte Carlo simulation")
+
+
+@pytest.fixture(scope="session")
+def synthetic_training_data():
+    """
+    Twenty (EnvironmentalData, risk score) training pairs, built once per session.
+    
+    Every field is drawn as one batch from a seeded generator, so the data is
+    the same on every run. The list is shared; tests must not mutate it.
+    """
+    rng = np.random.default_rng(42)
+    n = 20
+    
+    latitude = 40.0 + rng.normal(0, 0.1, n)
+    longitude = -120.0 + rng.normal(0, 0.1, n)
+    fuel_model = rng.integers(1, 14, n)
+    slope = rng.uniform(0, 45, n)
+    aspect = rng.uniform(0, 360, n)
+    canopy = rng.uniform(0, 1, n)
+    soil_moisture = rng.uniform(0, 1, n)
+    fuel_moisture = rng.uniform(0, 1, n)
+    temperature = rng.uniform(0, 40, n)
+    humidity = rng.uniform(10, 90, n)
+    wind_speed = rng.uniform(0, 30, n)
+    wind_direction = rng.uniform(0, 360, n)
+    lightning = rng.integers(0, 10, n)
+    ignitions = rng.integers(0, 5, n)
+    
+    # Synthetic risk scores
+    risk_scores = rng.uniform(0, 1, n)
+    
+    return [
+        (
+            EnvironmentalData(
+                latitude=latitude[i],
+                longitude=longitude[i],
+                timestamp="2024-01-01T00:00:00Z",
+                fuel_model=int(fuel_model[i]),
+                slope_deg=slope[i],
+                aspect_deg=aspect[i],
+                canopy_cover=canopy[i],
+                soil_moisture=soil_moisture[i],
+                fuel_moisture=fuel_moisture[i],
+                temperature_c=temperature[i],
+                relative_humidity=humidity[i],
+                wind_speed_mps=wind_speed[i],
+                wind_direction_deg=wind_direction[i],
+                elevation_m=1000.0,
+                lightning_strikes_24h=int(lightning[i]),
+                historical_ignitions=int(ignitions[i])
+            ),
+            risk_scores[i]
+        )
+        for i in range(n)
+    ]
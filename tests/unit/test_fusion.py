@@ -4,6 +4,7 @@ Unit tests for sensor fusion algorithms.
 
 import pytest
 import numpy as np
+from dataclasses import replace
 from packages.algorithms.src.fusion import (
     SensorFusionEngine,
     EnvironmentalData,
@@ -183,36 +184,11 @@ class TestSensorFusionEngine:
         # Should have some factors if model is trained
         # (This test will pass with heuristic method too)
     
-    def test_model_training(self):
+    @pytest.mark.slow
+    def test_model_training(self, synthetic_training_data):
         """Test model training with synthetic data."""
-        # Create synthetic training data
-        training_data = []
-        for i in range(20):
-            env_data = EnvironmentalData(
-                latitude=40.0 + np.random.normal(0, 0.1),
-                longitude=-120.0 + np.random.normal(0, 0.1),
-                timestamp="2024-01-01T00:00:00Z",
-                fuel_model=np.random.randint(1, 14),
-                slope_deg=np.random.uniform(0, 45),
-                aspect_deg=np.random.uniform(0, 360),
-                canopy_cover=np.random.uniform(0, 1),
-                soil_moisture=np.random.uniform(0, 1),
-                fuel_moisture=np.random.uniform(0, 1),
-                temperature_c=np.random.uniform(0, 40),
-                relative_humidity=np.random.uniform(10, 90),
-                wind_speed_mps=np.random.uniform(0, 30),
-                wind_direction_deg=np.random.uniform(0, 360),
-                elevation_m=1000.0,
-                lightning_strikes_24h=np.random.randint(0, 10),
-                historical_ignitions=np.random.randint(0, 5)
-            )
-            
-            # Create synthetic risk score
-            risk_score = np.random.uniform(0, 1)
-            training_data.append((env_data, risk_score))
-        
         # Train the model
-        self.engine.train_risk_model(training_data)
+        self.engine.train_risk_model(synthetic_training_data)
         
         # Test that model is trained
         assert self.engine.is_trained
@@ -222,6 +198,20 @@ class TestSensorFusionEngine:
         assert isinstance(risk_score, RiskScore)
         assert 0 <= risk_score.risk_score <= 1
     
+    def test_model_training_from_feature_matrix(self, synthetic_training_data):
+        """Test training directly on a stacked feature matrix."""
+        X = self.engine._extract_features_batch([env_data for env_data, _ in synthetic_training_data])
+        y = np.random.default_rng(3).integers(0, 2, len(X))
+        
+        self.engine.train_risk_model_arrays(X, y)
+        
+        assert self.engine.is_trained
+        risk_score = self.engine.calculate_risk_score(self.env_data)
+        assert 0 <= risk_score.risk_score <= 1
+        
+        with pytest.raises(ValueError, match="feature columns"):
+            self.engine.train_risk_model_arrays(X[:, :-1], y)
+    
     def test_model_training_insufficient_data(self):
         """Test model training with insufficient data."""
         # Create minimal training data
@@ -232,35 +222,11 @@ class TestSensorFusionEngine:
         with pytest.raises(ValueError, match="Need at least 10 training samples"):
             self.engine.train_risk_model(training_data)
     
-    def test_feature_importance(self):
+    @pytest.mark.slow
+    def test_feature_importance(self, synthetic_training_data):
         """Test feature importance after training."""
-        # Create training data
-        training_data = []
-        for i in range(20):
-            env_data = EnvironmentalData(
-                latitude=40.0,
-                longitude=-120.0,
-                timestamp="2024-01-01T00:00:00Z",
-                fuel_model=np.random.randint(1, 14),
-                slope_deg=np.random.uniform(0, 45),
-                aspect_deg=np.random.uniform(0, 360),
-                canopy_cover=np.random.uniform(0, 1),
-                soil_moisture=np.random.uniform(0, 1),
-                fuel_moisture=np.random.uniform(0, 1),
-                temperature_c=np.random.uniform(0, 40),
-                relative_humidity=np.random.uniform(10, 90),
-                wind_speed_mps=np.random.uniform(0, 30),
-                wind_direction_deg=np.random.uniform(0, 360),
-                elevation_m=1000.0,
-                lightning_strikes_24h=np.random.randint(0, 10),
-                historical_ignitions=np.random.randint(0, 5)
-            )
-            
-            risk_score = np.random.uniform(0, 1)
-            training_data.append((env_data, risk_score))
-        
         # Train the model
-        self.engine.train_risk_model(training_data)
+        self.engine.train_risk_model(synthetic_training_data)
         
         # Check feature importance
         assert isinstance(self.engine.feature_importance, dict)
@@ -273,29 +239,11 @@ class TestSensorFusionEngine:
     def test_risk_score_monotonicity(self):
         """Test that risk scores are monotonic with respect to risk factors."""
         # Test with increasing temperature
-        base_data = self.env_data
         temperatures = [20, 25, 30, 35, 40]
         risk_scores = []
         
         for temp in temperatures:
-            data = EnvironmentalData(
-                latitude=base_data.latitude,
-                longitude=base_data.longitude,
-                timestamp=base_data.timestamp,
-                fuel_model=base_data.fuel_model,
-                slope_deg=base_data.slope_deg,
-                aspect_deg=base_data.aspect_deg,
-                canopy_cover=base_data.canopy_cover,
-                soil_moisture=base_data.soil_moisture,
-                fuel_moisture=base_data.fuel_moisture,
-                temperature_c=temp,
-                relative_humidity=base_data.relative_humidity,
-                wind_speed_mps=base_data.wind_speed_mps,
-                wind_direction_deg=base_data.wind_direction_deg,
-                elevation_m=base_data.elevation_m,
-                lightning_strikes_24h=base_data.lightning_strikes_24h,
-                historical_ignitions=base_data.historical_ignitions
-            )
+            data = replace(self.env_data, temperature_c=temp)
             
             risk_score = self.engine.calculate_risk_score(data)
             risk_scores.append(risk_score.risk_score)
@@ -305,3 +253,61 @@ class TestSensorFusionEngine:
         increasing_count = sum(1 for i in range(1, len(risk_scores)) 
                              if risk_scores[i] >= risk_scores[i-1])
         assert increasing_count >= len(risk_scores) // 2  # At least half should be increasing
+    
+    def test_batch_risk_score_monotonicity(self):
+        """Test that batch risk scores are monotonic with respect to temperature."""
+        temperatures = [20, 25, 30, 35, 40]
+        batch = [replace(self.env_data, temperature_c=temp) for temp in temperatures]
+        risk_scores = [score.risk_score for score in self.engine.calculate_risk_scores_batch(batch)]
+        
+        increasing_count = sum(1 for i in range(1, len(risk_scores))
+                               if risk_scores[i] >= risk_scores[i-1])
+        assert increasing_count >= len(risk_scores) // 2
+    
+    def test_batch_matches_single_scores(self):
+        """Test that batch scoring agrees with per-record scoring."""
+        batch = [
+            self.env_data,
+            replace(self.env_data, fuel_model=0, wind_speed_mps=0.0),
+            replace(self.env_data, fuel_model=13, temperature_c=65.0, relative_humidity=3.0)
+        ]
+        
+        batch_scores = self.engine.calculate_risk_scores_batch(batch)
+        
+        assert len(batch_scores) == len(batch)
+        for data, batch_score in zip(batch, batch_scores):
+            single_score = self.engine.calculate_risk_score(data)
+            assert batch_score.risk_score == pytest.approx(single_score.risk_score)
+            assert batch_score.confidence == pytest.approx(single_score.confidence)
+            assert batch_score.contributing_factors == pytest.approx(single_score.contributing_factors)
+        
+        assert self.engine.calculate_risk_scores_batch([]) == []
+    
+    def test_batch_matches_single_scores_trained(self, synthetic_training_data):
+        """Test that batch scoring agrees with per-record scoring on a trained model."""
+        env_data_list = [env_data for env_data, _ in synthetic_training_data]
+        X = self.engine._extract_features_batch(env_data_list)
+        y = (np.array([risk for _, risk in synthetic_training_data]) > 0.5).astype(int)
+        self.engine.train_risk_model_arrays(X, y)
+        
+        batch = env_data_list[:5] + [self.env_data]
+        batch_scores = self.engine.calculate_risk_scores_batch(batch)
+        
+        assert len(batch_scores) == len(batch)
+        for data, batch_score in zip(batch, batch_scores):
+            single_score = self.engine.calculate_risk_score(data)
+            # The batch path multiplies the float32 weights as one matrix, so
+            # it agrees with the per-record path up to float32 rounding
+            assert batch_score.risk_score == pytest.approx(single_score.risk_score, abs=1e-3)
+            assert batch_score.confidence == pytest.approx(single_score.confidence)
+            assert batch_score.contributing_factors == pytest.approx(single_score.contributing_factors)
+    
+    def test_multiclass_model_uses_sklearn_probabilities(self, synthetic_training_data):
+        """Test that a non-binary model skips the frozen sigmoid."""
+        env_data_list = [env_data for env_data, _ in synthetic_training_data]
+        X = self.engine._extract_features_batch(env_data_list)
+        y = np.digitize([risk for _, risk in synthetic_training_data], [0.33, 0.66])
+        self.engine.train_risk_model_arrays(X, y)
+        
+        expected = self.engine.risk_model.predict_proba(self.engine.scaler.transform(X[:5]))[:, 1]
+        np.testing.assert_allclose(self.engine._predict_proba(X[:5]), expected)
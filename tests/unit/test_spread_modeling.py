@@ -4,20 +4,31 @@ Unit tests for fire spread modeling algorithms.
 
 import pytest
 import numpy as np
+from dataclasses import replace
+from packages.algorithms.src import spread_modeling
 from packages.algorithms.src.spread_modeling import (
     FireSpreadEngine,
     SpreadParameters,
-    SpreadResult
+    SpreadResult,
+    _SpreadGrid
 )
 
 
+@pytest.fixture(scope="module")
+def spread_engine():
+    """One engine for the module; FireSpreadEngine holds no per-simulation state."""
+    return FireSpreadEngine()
+
+
 class TestFireSpreadEngine:
     """Test cases for fire spread engine."""
     
+    @pytest.fixture(autouse=True)
+    def _use_engine(self, spread_engine):
+        self.engine = spread_engine
+    
     def setup_method(self):
         """Set up test fixtures."""
-        self.engine = FireSpreadEngine()
-        
         # Create test spread parameters
         self.spread_params = SpreadParameters(
             ignition_points=[(40.0, -120.0)],  # Single ignition point
@@ -176,12 +187,14 @@ class TestFireSpreadEngine:
             assert 'description' in model_data
             assert model_data['base_rate'] > 0
     
+    @pytest.mark.slow
     def test_spread_simulation_consistency(self):
         """Test that spread simulation results are consistent."""
-        # Run multiple simulations with same parameters
+        # Run multiple simulations with same parameters; only aggregates are checked
+        params = replace(self.spread_params, compute_isochrones=False, compute_perimeter=False)
         results = []
         for _ in range(3):
-            result = self.engine.simulate_spread(self.spread_params)
+            result = self.engine.simulate_spread(params)
             results.append(result)
         
         # All results should have similar properties
@@ -196,15 +209,63 @@ class TestFireSpreadEngine:
         rate_std = np.std(rates)
         assert rate_std < np.mean(rates) * 0.5  # Standard deviation < 50% of mean
     
+    def test_monte_carlo_runs_reproducible_with_seed(self):
+        """Test that seeding NumPy makes the Monte Carlo runs repeatable."""
+        grid = _SpreadGrid(west=-120.0, south=40.0, cell_size=0.01, width=40, height=40)
+        
+        np.random.seed(42)
+        cells, areas, _ = self.engine._simulate_runs(self.spread_params, grid)
+        np.random.seed(42)
+        repeat_cells, repeat_areas, _ = self.engine._simulate_runs(self.spread_params, grid)
+        
+        assert len(cells) == self.spread_params.monte_carlo_runs
+        np.testing.assert_array_equal(areas, repeat_areas)
+        for run_cells, repeat_run_cells in zip(cells, repeat_cells):
+            np.testing.assert_array_equal(run_cells, repeat_run_cells)
+    
+    @pytest.mark.skipif(not spread_modeling.NUMBA_AVAILABLE, reason="numba not installed")
+    def test_numpy_fallback_matches_kernel_statistically(self, monkeypatch):
+        """Test that the NumPy fallback burns like the compiled kernel."""
+        params = replace(self.spread_params, monte_carlo_runs=400, fuel_model=13,
+                         humidity=15.0, fuel_moisture=0.1)
+        grid = _SpreadGrid(west=-120.4, south=39.6, cell_size=0.01, width=80, height=80)
+        
+        np.random.seed(7)
+        kernel_cells, kernel_areas, _ = self.engine._simulate_runs(params, grid)
+        monkeypatch.setattr(spread_modeling, "NUMBA_AVAILABLE", False)
+        np.random.seed(7)
+        numpy_cells, numpy_areas, _ = self.engine._simulate_runs(params, grid)
+        
+        # Different random streams, so compare distributions: mean burned area within 4 standard errors
+        standard_error = np.sqrt(kernel_areas.var() / kernel_areas.size + numpy_areas.var() / numpy_areas.size)
+        assert abs(kernel_areas.mean() - numpy_areas.mean()) < 4 * standard_error
+        
+        # Union perimeters cover a similar footprint around the same centre
+        kernel_perimeter = self.engine._calculate_final_perimeter(kernel_cells, grid)
+        numpy_perimeter = self.engine._calculate_final_perimeter(numpy_cells, grid)
+        assert len(numpy_perimeter) == pytest.approx(len(kernel_perimeter), rel=0.6)
+        np.testing.assert_allclose(numpy_perimeter.mean(axis=0), kernel_perimeter.mean(axis=0), atol=0.06)
+    
+    def test_spread_simulation_without_geometry(self):
+        """Test that isochrones and perimeter can be skipped."""
+        params = replace(self.spread_params, compute_isochrones=False, compute_perimeter=False)
+        
+        result = self.engine.simulate_spread(params)
+        
+        assert result.isochrones == []
+        assert result.perimeter.shape == (0, 2)
+        assert result.total_area_hectares > 0
+    
     def test_isochrone_generation(self):
         """Test isochrone generation."""
-        # Create mock perimeters for different time steps
-        all_perimeters = [
-            [(40.0, -120.0), (40.01, -120.0), (40.0, -119.99)],  # Early
-            [(40.0, -120.0), (40.02, -120.0), (40.0, -119.98), (40.01, -119.99)],  # Later
+        # Create mock burned cells (linear indices) for different runs
+        grid = _SpreadGrid(west=-120.0, south=40.0, cell_size=0.01, width=3, height=3)
+        all_cells = [
+            np.array([0, 3, 1]),  # Early
+            np.array([0, 6, 2, 4]),  # Later
         ]
         
-        isochrones = self.engine._generate_isochrones(all_perimeters, self.spread_params)
+        isochrones = self.engine._generate_isochrones(all_cells, self.spread_params, grid)
         
         assert isinstance(isochrones, list)
         assert len(isochrones) > 0
@@ -220,23 +281,22 @@ class TestFireSpreadEngine:
     
     def test_final_perimeter_calculation(self):
         """Test final perimeter calculation."""
-        all_perimeters = [
-            [(40.0, -120.0), (40.01, -120.0)],
-            [(40.0, -120.0), (40.0, -119.99)],
-            [(40.01, -120.0), (40.0, -119.99)]
+        grid = _SpreadGrid(west=-120.0, south=40.0, cell_size=0.01, width=3, height=3)
+        all_cells = [
+            np.array([0, 3]),
+            np.array([0, 1]),
+            np.array([3, 1])
         ]
         
-        final_perimeter = self.engine._calculate_final_perimeter(all_perimeters)
+        final_perimeter = self.engine._calculate_final_perimeter(all_cells, grid)
         
-        assert isinstance(final_perimeter, list)
-        assert len(final_perimeter) > 0
+        assert isinstance(final_perimeter, np.ndarray)
+        assert final_perimeter.shape == (3, 2)  # Union of runs is deduplicated
         
-        # All points should be tuples of (lat, lon)
-        for point in final_perimeter:
-            assert isinstance(point, tuple)
-            assert len(point) == 2
-            assert isinstance(point[0], (int, float))  # latitude
-            assert isinstance(point[1], (int, float))  # longitude
+        # Rows are (lat, lon) points
+        assert np.issubdtype(final_perimeter.dtype, np.floating)
+        np.testing.assert_allclose(final_perimeter[:, 0], [40.0, 40.0, 40.01])  # latitude
+        np.testing.assert_allclose(final_perimeter[:, 1], [-120.0, -119.99, -120.0])  # longitude
     
     def test_confidence_calculation(self):
         """Test confidence calculation."""
@@ -255,37 +315,22 @@ class TestFireSpreadEngine:
         consistent_confidence = self.engine._calculate_confidence(consistent_areas, consistent_rates)
         assert consistent_confidence > confidence
     
+    @pytest.mark.slow
     def test_spread_simulation_with_different_conditions(self):
         """Test spread simulation with different environmental conditions."""
         # High wind conditions
-        high_wind_params = SpreadParameters(
-            ignition_points=[(40.0, -120.0)],
+        high_wind_params = replace(
+            self.spread_params,
             wind_speed=25.0,  # Very high wind
-            wind_direction=270.0,
             temperature=35.0,
             humidity=20.0,
-            fuel_moisture=0.1,
-            fuel_model=4,
-            simulation_hours=12,
-            time_step_minutes=15,
-            monte_carlo_runs=10
+            fuel_moisture=0.1
         )
         
         high_wind_result = self.engine.simulate_spread(high_wind_params)
         
         # Low wind conditions
-        low_wind_params = SpreadParameters(
-            ignition_points=[(40.0, -120.0)],
-            wind_speed=2.0,  # Low wind
-            wind_direction=270.0,
-            temperature=35.0,
-            humidity=20.0,
-            fuel_moisture=0.1,
-            fuel_model=4,
-            simulation_hours=12,
-            time_step_minutes=15,
-            monte_carlo_runs=10
-        )
+        low_wind_params = replace(high_wind_params, wind_speed=2.0)  # Low wind
         
         low_wind_result = self.engine.simulate_spread(low_wind_params)
         
@@ -314,18 +359,7 @@ class TestFireSpreadEngine:
         assert result.total_area_hectares >= 0
         
         # Very high moisture
-        high_moisture_params = SpreadParameters(
-            ignition_points=[(40.0, -120.0)],
-            wind_speed=10.0,
-            wind_direction=270.0,
-            temperature=30.0,
-            humidity=90.0,
-            fuel_moisture=0.9,
-            fuel_model=1,
-            simulation_hours=6,
-            time_step_minutes=30,
-            monte_carlo_runs=5
-        )
+        high_moisture_params = replace(zero_wind_params, wind_speed=10.0, humidity=90.0, fuel_moisture=0.9)
         
         result = self.engine.simulate_spread(high_moisture_params)
         assert isinstance(result, SpreadResult)
@@ -4,56 +4,74 @@ Unit tests for triangulation algorithms.
 
 import pytest
 import numpy as np
+from dataclasses import replace
+from scipy.optimize import least_squares
+from packages.algorithms.src import triangulation
 from packages.algorithms.src.triangulation import (
     TriangulationEngine,
     BearingObservation,
-    TriangulationResult
+    TriangulationResult,
+    _ObservationArrays,
+    _batch_angle_difference,
+    _batch_bearing,
+    _batch_ray_intersection
 )
 
 
+@pytest.fixture(scope="module")
+def triangulation_engine():
+    """One engine for the module; TriangulationEngine holds no per-call results."""
+    with TriangulationEngine() as engine:
+        yield engine
+
+
+@pytest.fixture(scope="module")
+def bearing_observations():
+    """Observations from three cameras; BearingObservation is frozen, so the list is shared."""
+    return [
+        BearingObservation(
+            device_id="camera_1",
+            latitude=40.0,
+            longitude=-120.0,
+            altitude=1000.0,
+            camera_heading=0.0,
+            camera_pitch=0.0,
+            bearing=45.0,
+            confidence=0.9,
+            detection_id="det_1"
+        ),
+        BearingObservation(
+            device_id="camera_2",
+            latitude=40.1,
+            longitude=-119.9,
+            altitude=1100.0,
+            camera_heading=90.0,
+            camera_pitch=0.0,
+            bearing=315.0,
+            confidence=0.8,
+            detection_id="det_2"
+        ),
+        BearingObservation(
+            device_id="camera_3",
+            latitude=39.9,
+            longitude=-119.8,
+            altitude=950.0,
+            camera_heading=180.0,
+            camera_pitch=0.0,
+            bearing=225.0,
+            confidence=0.85,
+            detection_id="det_3"
+        )
+    ]
+
+
 class TestTriangulationEngine:
     """Test cases for triangulation engine."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.engine = TriangulationEngine()
-        
-        # Create test observations
-        self.observations = [
-            BearingObservation(
-                device_id="camera_1",
-                latitude=40.0,
-                longitude=-120.0,
-                altitude=1000.0,
-                camera_heading=0.0,
-                camera_pitch=0.0,
-                bearing=45.0,
-                confidence=0.9,
-                detection_id="det_1"
-            ),
-            BearingObservation(
-                device_id="camera_2",
-                latitude=40.1,
-                longitude=-119.9,
-                altitude=1100.0,
-                camera_heading=90.0,
-                camera_pitch=0.0,
-                bearing=315.0,
-                confidence=0.8,
-                detection_id="det_2"
-            ),
-            BearingObservation(
-                device_id="camera_3",
-                latitude=39.9,
-                longitude=-119.8,
-                altitude=950.0,
-                camera_heading=180.0,
-                camera_pitch=0.0,
-                bearing=225.0,
-                confidence=0.85,
-                detection_id="det_3"
-            )
-        ]
+    @pytest.fixture(autouse=True)
+    def _use_fixtures(self, triangulation_engine, bearing_observations):
+        self.engine = triangulation_engine
+        self.observations = bearing_observations
     
     def test_triangulate_sufficient_observations(self):
         """Test triangulation with sufficient observations."""
@@ -64,14 +82,87 @@ class TestTriangulationEngine:
         assert 0 <= results[0].confidence <= 1
         assert results[0].uncertainty_meters > 0
     
-    def test_triangulate_insufficient_observations(self):
+    def test_triangulate_batch_equivalence(self):
+        """Test that concurrent group triangulation matches sequential calls."""
+        outlier_obs = replace(self.observations[0], latitude=50.0, longitude=-100.0,
+                              bearing=0.0, detection_id="det_outlier")
+        groups = [self.observations, self.observations + [outlier_obs], self.observations[:2],
+                  [self.observations[0]]]
+        
+        assert self.engine.triangulate_batch(groups) == [self.engine.triangulate(obs) for obs in groups]
+    
+    @pytest.mark.skipif(not triangulation.NUMBA_AVAILABLE, reason="numba not installed")
+    def test_triangulate_batch_workers_use_serial_kernel(self, monkeypatch):
+        """Test that batch workers reach RANSAC through the thread-safe serial kernel."""
+        rng = np.random.default_rng(7)
+        groups = [
+            [
+                replace(self.observations[0], device_id=f"camera_{g}_{k}", detection_id=f"det_{g}_{k}",
+                        latitude=40.0 + 0.1 * rng.random(), longitude=-120.0 + 0.1 * rng.random(),
+                        bearing=360.0 * rng.random())
+                for k in range(6)
+            ]
+            for g in range(16)
+        ]
+        expected = [self.engine.triangulate(obs) for obs in groups]
+        
+        serial_calls = []
+        serial_kernel = triangulation._ransac_pair_kernel_serial
+        
+        def parallel_kernel(*args):
+            raise AssertionError("parallel pair kernel entered from a batch worker")
+        
+        def counting_serial_kernel(*args):
+            serial_calls.append(len(args[5]))
+            serial_kernel(*args)
+        
+        monkeypatch.setattr(triangulation, "_ransac_pair_kernel", parallel_kernel)
+        monkeypatch.setattr(triangulation, "_ransac_pair_kernel_serial", counting_serial_kernel)
+        
+        assert self.engine.triangulate_batch(groups, max_workers=4) == expected
+        assert len(serial_calls) == len(groups)
+    
+    def test_seeded_engines_sample_ransac_pairs_identically(self):
+        """Test that a seed fixes the RANSAC pair order on inputs too large to search exhaustively."""
+        rng = np.random.default_rng(11)
+        observations = [
+            replace(self.observations[0], device_id=f"camera_{k}", detection_id=f"det_{k}",
+                    latitude=40.0 + 0.1 * rng.random(), longitude=-120.0 + 0.1 * rng.random(),
+                    bearing=360.0 * rng.random())
+            for k in range(30)
+        ]
+        
+        with TriangulationEngine(seed=5) as first, TriangulationEngine(seed=5) as second:
+            assert first.triangulate(observations) == second.triangulate(observations)
+    
+    def test_close_shuts_down_ransac_executor(self):
+        """Test that close() releases the worker pool and a later call recreates it."""
+        with TriangulationEngine(ransac_threads=2) as engine:
+            executor = engine._get_ransac_executor()
+            engine.close()
+            
+            assert engine._ransac_executor is None
+            with pytest.raises(RuntimeError):
+                executor.submit(int)
+            assert engine._get_ransac_executor() is not executor
+        
+        assert engine._ransac_executor is None
+    
+    def _fail_on_array_build(self, monkeypatch):
+        """Make building observation arrays an error, to check triangulate exits before it."""
+        def fail(*args, **kwargs):
+            raise AssertionError("observation arrays built for a trivially empty result")
+        monkeypatch.setattr(_ObservationArrays, "from_observations", fail)
+    
+    def test_triangulate_insufficient_observations(self, monkeypatch):
         """Test triangulation with insufficient observations."""
+        self._fail_on_array_build(monkeypatch)
         single_obs = [self.observations[0]]
         results = self.engine.triangulate(single_obs)
         
         assert len(results) == 0
     
-    def test_triangulate_low_confidence_filtering(self):
+    def test_triangulate_low_confidence_filtering(self, monkeypatch):
         """Test that low confidence observations are filtered out."""
         low_confidence_obs = [
             BearingObservation(
@@ -98,6 +189,7 @@ class TestTriangulationEngine:
             )
         ]
         
+        self._fail_on_array_build(monkeypatch)
         results = self.engine.triangulate(low_confidence_obs)
         assert len(results) == 0
     
@@ -124,41 +216,62 @@ class TestTriangulationEngine:
         assert intersection is not None
         assert len(intersection) == 3
     
-    def test_calculate_bearing(self):
-        """Test bearing calculation between two points."""
-        # Test bearing from origin to north
-        bearing = self.engine._calculate_bearing(0, 0, 1, 0)
-        assert abs(bearing - 0) < 1e-6
-        
-        # Test bearing from origin to east
-        bearing = self.engine._calculate_bearing(0, 0, 0, 1)
-        assert abs(bearing - 90) < 1e-6
-        
-        # Test bearing from origin to south
-        bearing = self.engine._calculate_bearing(0, 0, -1, 0)
-        assert abs(bearing - 180) < 1e-6
-        
-        # Test bearing from origin to west
-        bearing = self.engine._calculate_bearing(0, 0, 0, -1)
-        assert abs(bearing - 270) < 1e-6
+    def test_batched_ray_intersection_matches_scalar(self):
+        """Test the batched and compiled pair intersections against the scalar one."""
+        arrays = _ObservationArrays.from_observations(self.observations, self.engine.earth_radius)
+        P, D = arrays.positions, arrays.directions
+        i_idx, j_idx = np.triu_indices(len(self.observations), k=1)
+        
+        points, valid = _batch_ray_intersection(P[i_idx], D[i_idx], P[j_idx], D[j_idx])
+        inlier_mask, kernel_points = self.engine._pair_inlier_mask(
+            P, D, arrays.lats, arrays.lons, arrays.bearings, i_idx, j_idx
+        )
+        
+        for k, (i, j) in enumerate(zip(i_idx, j_idx)):
+            expected = self.engine._ray_intersection(P[i], D[i], P[j], D[j])
+            if expected is None:
+                assert not valid[k]
+                assert not inlier_mask[k].any()
+            else:
+                assert valid[k]
+                np.testing.assert_allclose(points[k], expected, rtol=1e-10, atol=0)
+                np.testing.assert_allclose(kernel_points[k], expected, rtol=1e-10, atol=0)
     
-    def test_angle_difference(self):
+    @pytest.mark.parametrize(
+        "lat2,lon2,expected",
+        [(1, 0, 0), (0, 1, 90), (-1, 0, 180), (0, -1, 270)],
+        ids=["north", "east", "south", "west"]
+    )
+    def test_calculate_bearing(self, lat2, lon2, expected):
+        """Test bearing calculation from the origin to each cardinal direction."""
+        bearing = self.engine._calculate_bearing(0, 0, lat2, lon2)
+        assert abs(bearing - expected) < 1e-6
+    
+    @pytest.mark.parametrize(
+        "angle1,angle2,expected",
+        [(45, 45, 0), (0, 90, 90), (350, 10, 20), (90, 0, 90)],
+        ids=["same", "quarter", "wrapping", "negative"]
+    )
+    def test_angle_difference(self, angle1, angle2, expected):
         """Test angle difference calculation."""
-        # Test same angles
-        diff = self.engine._angle_difference(45, 45)
-        assert diff == 0
-        
-        # Test 90 degree difference
-        diff = self.engine._angle_difference(0, 90)
-        assert diff == 90
+        assert self.engine._angle_difference(angle1, angle2) == expected
+    
+    def test_angle_difference_vectorized(self):
+        """Test angle difference over array inputs."""
+        diffs = _batch_angle_difference(np.array([45.0, 0.0, 350.0, 90.0]), np.array([45.0, 90.0, 10.0, 0.0]))
+        assert diffs.shape == (4,)
+        np.testing.assert_array_equal(diffs, [0.0, 90.0, 20.0, 90.0])
+    
+    def test_batch_bearing_matches_scalar(self):
+        """Test array bearings against the scalar bearing calculation."""
+        lat2 = np.array([1.0, 0.0, -1.0, 0.0, 40.1])
+        lon2 = np.array([0.0, 1.0, 0.0, -1.0, -119.9])
         
-        # Test angle wrapping
-        diff = self.engine._angle_difference(350, 10)
-        assert diff == 20
+        bearings = _batch_bearing(0.0, 0.0, lat2, lon2)
+        expected = [self.engine._calculate_bearing(0.0, 0.0, la, lo) for la, lo in zip(lat2, lon2)]
         
-        # Test negative difference
-        diff = self.engine._angle_difference(90, 0)
-        assert diff == 90
+        assert bearings.shape == (5,)
+        np.testing.assert_allclose(bearings, expected, rtol=1e-12)
     
     def test_calculate_confidence(self):
         """Test confidence calculation."""
@@ -178,17 +291,8 @@ class TestTriangulationEngine:
         # Test with bearings in sequence
         sequential_bearings = [0, 90, 180, 270]
         spread = self.engine._calculate_angular_spread([
-            BearingObservation(
-                device_id="camera_1",
-                latitude=40.0,
-                longitude=-120.0,
-                altitude=1000.0,
-                camera_heading=0.0,
-                camera_pitch=0.0,
-                bearing=bearing,
-                confidence=0.9,
-                detection_id=f"det_{i}"
-            ) for i, bearing in enumerate(sequential_bearings)
+            replace(self.observations[0], bearing=bearing, detection_id=f"det_{i}")
+            for i, bearing in enumerate(sequential_bearings)
         ])
         assert spread == 90  # Maximum gap should be 90 degrees
     
@@ -204,6 +308,16 @@ class TestTriangulationEngine:
         distance = self.engine._calculate_baseline_distance(obs1, obs1)
         assert distance == 0
     
+    def test_assess_observations_matches_helpers(self):
+        """Test the single-pass summary against the individual helpers."""
+        arrays = _ObservationArrays.summary(self.observations)
+        confidence, uncertainty, spread, baseline = self.engine._assess_observations(arrays)
+        
+        assert confidence == self.engine._calculate_confidence(self.observations)
+        assert uncertainty == self.engine._calculate_uncertainty(self.observations)
+        assert spread == self.engine._calculate_angular_spread(self.observations)
+        assert baseline == self.engine._calculate_baseline_distance(self.observations[0], self.observations[-1])
+    
     def test_latlon_to_cartesian_conversion(self):
         """Test lat/lon to Cartesian conversion."""
         lat, lon, alt = 40.0, -120.0, 1000.0
@@ -214,14 +328,31 @@ class TestTriangulationEngine:
         
         # Convert back and check
         lat_back, lon_back, alt_back = self.engine._cartesian_to_latlon(cartesian)
-        assert abs(lat - lat_back) < 1e-6
-        assert abs(lon - lon_back) < 1e-6
+        assert abs(lat - lat_back) < 1e-9
+        assert abs(lon - lon_back) < 1e-9
         assert abs(alt - alt_back) < 1e-6
     
+    def test_observation_arrays_match_scalar_conversion(self):
+        """Test batched observation columns against per-observation conversion."""
+        arrays = _ObservationArrays.from_observations(self.observations, self.engine.earth_radius)
+        n = len(self.observations)
+        
+        assert arrays.positions.shape == (n, 3)
+        assert arrays.directions.shape == (n, 3)
+        assert arrays.lats.flags.c_contiguous
+        np.testing.assert_array_equal(arrays.bearings, [obs.bearing for obs in self.observations])
+        
+        expected = np.array([
+            self.engine._latlon_to_cartesian(obs.latitude, obs.longitude, obs.altitude)
+            for obs in self.observations
+        ])
+        np.testing.assert_allclose(arrays.positions, expected, rtol=1e-12, atol=0)
+        np.testing.assert_allclose(np.linalg.norm(arrays.directions, axis=1), 1.0, rtol=1e-12)
+    
     def test_bearing_to_direction_conversion(self):
         """Test bearing to direction vector conversion."""
         bearing, pitch = 0.0, 0.0  # North, horizontal
-        direction = self.engine._bearing_to_direction(bearing, pitch)
+        direction = self.engine._bearing_to_direction(bearing, pitch, 0.0, 0.0)
         
         assert len(direction) == 3
         assert isinstance(direction, np.ndarray)
@@ -229,6 +360,17 @@ class TestTriangulationEngine:
         # Check that direction vector is normalized
         magnitude = np.linalg.norm(direction)
         assert abs(magnitude - 1.0) < 1e-6
+        
+        # North from the equator at the prime meridian is the Earth's axis
+        np.testing.assert_allclose(direction, [0.0, 0.0, 1.0], atol=1e-12)
+        
+        # Same frame as the batched conversion
+        arrays = _ObservationArrays.from_observations(self.observations, self.engine.earth_radius)
+        expected = np.array([
+            self.engine._bearing_to_direction(obs.bearing, obs.camera_pitch, obs.latitude, obs.longitude)
+            for obs in self.observations
+        ])
+        np.testing.assert_allclose(arrays.directions, expected, rtol=1e-12, atol=1e-15)
     
     def test_ransac_outlier_rejection(self):
         """Test RANSAC outlier rejection."""
@@ -253,6 +395,24 @@ class TestTriangulationEngine:
         # Outlier should be filtered out
         assert "det_outlier" not in results[0].observation_ids
     
+    @pytest.mark.skipif(not triangulation.NUMBA_AVAILABLE, reason="numba not installed")
+    def test_ransac_inliers_match_numpy_path(self, monkeypatch):
+        """Test the compiled RANSAC scoring against the NumPy fallback."""
+        outlier_obs = replace(self.observations[0], latitude=50.0, longitude=-100.0,
+                              bearing=0.0, detection_id="det_outlier")
+        observations = self.observations + [outlier_obs]
+        arrays = _ObservationArrays.from_observations(observations, self.engine.earth_radius)
+        i_idx, j_idx = np.triu_indices(len(observations), k=1)
+        args = (arrays.positions, arrays.directions, arrays.lats, arrays.lons, arrays.bearings, i_idx, j_idx)
+        
+        compiled_mask, _ = self.engine._pair_inlier_mask(*args)
+        serial_mask, _ = self.engine._pair_inlier_mask(*args, parallel=False)
+        monkeypatch.setattr(triangulation, "NUMBA_AVAILABLE", False)
+        numpy_mask, _ = self.engine._pair_inlier_mask(*args)
+        
+        np.testing.assert_array_equal(compiled_mask, numpy_mask)
+        np.testing.assert_array_equal(serial_mask, numpy_mask)
+    
     def test_least_squares_optimization(self):
         """Test least squares optimization method."""
         results = self.engine.triangulate(self.observations)
@@ -266,3 +426,35 @@ class TestTriangulationEngine:
         assert -180 <= result.longitude <= 180
         assert 0 <= result.confidence <= 1
         assert result.uncertainty_meters > 0
+    
+    def test_closed_form_matches_iterative(self):
+        """Test the normal-equations solve against an iterative least-squares fit."""
+        # Aim every camera at a common target so all rays point towards it
+        observations = [
+            replace(obs, bearing=self.engine._calculate_bearing(obs.latitude, obs.longitude, 40.02, -119.9))
+            for obs in self.observations
+        ]
+        result = self.engine._least_squares_triangulation(observations)
+        assert result is not None
+        
+        arrays = _ObservationArrays.from_observations(observations, self.engine.earth_radius)
+        P, D, w = arrays.positions, arrays.directions, arrays.confidences
+        
+        def residuals(x):
+            v = x - P
+            return (w[:, None] * (v - np.einsum("ij,ij->i", v, D)[:, None] * D)).ravel()
+        
+        iterative = least_squares(residuals, P.mean(axis=0), xtol=1e-15, ftol=1e-15, gtol=1e-15).x
+        closed_form = self.engine._latlon_to_cartesian(result.latitude, result.longitude, result.altitude)
+        assert np.linalg.norm(closed_form - iterative) < 1e-6
+        
+        # residual_error is the confidence-weighted squared bearing error in deg^2
+        errors = [
+            self.engine._angle_difference(
+                obs.bearing,
+                self.engine._calculate_bearing(obs.latitude, obs.longitude, result.latitude, result.longitude)
+            )
+            for obs in observations
+        ]
+        expected = sum((error * obs.confidence) ** 2 for error, obs in zip(errors, observations))
+        assert result.quality_metrics["residual_error"] == pytest.approx(expected)